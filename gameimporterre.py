@@ -11,11 +11,13 @@ bl_info = {
 import bpy
 import struct
 import os
+import hashlib
 import traceback
 import math
+import functools
 from bpy.props import StringProperty, PointerProperty, CollectionProperty, IntProperty, BoolProperty
 from bpy.types import Operator, Panel, PropertyGroup, UIList
-from mathutils import Vector, Quaternion, Matrix
+from mathutils import Vector, Matrix, kdtree
 
 try:
     from PIL import Image
@@ -24,27 +26,499 @@ try:
 except ImportError:
     PIL_AVAILABLE = False
 
+# Kayıt başına (kemik, materyal, texture) debug çıktısı; konsol satır satır flush edildiği için
+# varsayılan kapalı, her import başında panelden (verbose_debug) ayarlanır
+VERBOSE_DEBUG = False
+
+# ============================================================================
+# Binary Formatlar (SRO dosyaları little-endian; biçimler bir kez derlenir)
+# ============================================================================
+_S_U32 = struct.Struct('<I')          # uzunluk / sayaç / flag
+_S_F32 = struct.Struct('<f')
+_S_COLORS = struct.Struct('<16f')     # BMT: 4 adet RGBA renk
+_S_BMS_HEADER = struct.Struct('<12I') # BMS offset tablosu
+# BSK kemik transform bloğu (84 byte): parent rot/trans atlanır, origin rot(4f)+trans(3f), local atlanır
+_S_BSK_BONE_BLK = struct.Struct('<28x4f3f28x')
+
 # ============================================================================
 # SRO→Blender Koordinat Sistemi Dönüşüm Yardımcıları
 # ============================================================================
-SRO_TO_BLENDER_POS_MATRIX = Matrix((
-    (1,  0,  0, 0),    # X -> X
-    (0,  0, -1, 0),    # Y -> -Z (90° X rotation for OBJ compatibility)
-    (0,  1,  0, 0),    # Z -> Y
-    (0, 0, 0, 1)
-))
-C3 = SRO_TO_BLENDER_POS_MATRIX.to_3x3()
-
-def convert_vec_sro_to_blender(v: Vector) -> Vector:
-    """SRO vektörünü Blender koordinat sistemine dönüştür"""
-    return SRO_TO_BLENDER_POS_MATRIX @ v
-
-def convert_quat_sro_to_blender(q: Quaternion) -> Quaternion:
-    """SRO quaternion'ını Blender koordinat sistemine dönüştür (temel değişimi/benzerlik dönüşümü)"""
-    # q: (w, x, y, z) biçiminde, SRO kemik yerel uzayında
-    m = q.to_matrix()               # 3x3
-    m_conv = C3 @ m @ C3.inverted() # temel değişimi (benzerlik)
-    return m_conv.to_quaternion().normalized()
+def convert_vecs_sro_to_blender(arr, dtype=None):
+    """Nx3 SRO vektör dizisini tek seferde Blender koordinat sistemine dönüştür"""
+    # X -> X, Y -> -Z, Z -> Y (90° X rotasyonu, OBJ uyumlu)
+    import numpy as np
+    src = np.asarray(arr).reshape(-1, 3)
+    # Permütasyon + işaret çevirme, hedef dizine tek geçişte yazılır (ara kopya yok)
+    out = np.empty(src.shape, dtype=dtype or np.float64)
+    out[:, 0] = src[:, 0]
+    np.negative(src[:, 2], out=out[:, 1])
+    out[:, 2] = src[:, 1]
+    return out
+
+def convert_quats_sro_to_blender(arr):
+    """Nx4 (w, x, y, z) SRO quaternion dizisini tek seferde Blender'a dönüştür"""
+    import numpy as np
+    out = np.array(arr, dtype=np.float64).reshape(-1, 4)[:, [0, 1, 3, 2]]
+    out[:, 2] *= -1.0
+    norms = np.linalg.norm(out, axis=1, keepdims=True)
+    np.divide(out, norms, out=out, where=norms > 0.0)
+    return out
+
+def rotate_vectors(quats, vecs):
+    """Nx4 (w, x, y, z) birim quaternion dizisiyle Nx3 vektör dizisini satır satır döndür (açık formül, NumPy)"""
+    import numpy as np
+    q = np.ascontiguousarray(quats, dtype=np.float64).reshape(-1, 4)
+    v = np.ascontiguousarray(vecs, dtype=np.float64).reshape(-1, 3)
+    w, x, y, z = q[:, 0], q[:, 1], q[:, 2], q[:, 3]
+    vx, vy, vz = v[:, 0], v[:, 1], v[:, 2]
+    out = np.empty_like(v)
+    out[:, 0] = (w*w + x*x - y*y - z*z) * vx - 2.0 * (w*z - x*y) * vy + 2.0 * (w*y + x*z) * vz
+    out[:, 1] = 2.0 * (w*z + x*y) * vx + (w*w - x*x + y*y - z*z) * vy - 2.0 * (w*x - y*z) * vz
+    out[:, 2] = 2.0 * (x*z - w*y) * vx + 2.0 * (w*x + y*z) * vy + (w*w - x*x - y*y + z*z) * vz
+    return out
+
+def bone_rest_arrays(bones):
+    """BSK kemik listesi için Blender uzayında (head'ler Nx3, yaprak yönleri Nx3) dizilerini döndür"""
+    import numpy as np
+    heads_bl = convert_vecs_sro_to_blender([b['translation'] for b in bones])
+    # BSK rotasyonları (x, y, z, w) sırasında saklanır
+    quats_bl = convert_quats_sro_to_blender([(qw, qx, qy, qz) for qx, qy, qz, qw in (b['rotation'] for b in bones)])
+    # Yaprak kemiklerin yönü: yerel +Y ekseni kemik rotasyonuyla döndürülür
+    leaf_dirs = rotate_vectors(quats_bl, np.tile((0.0, 1.0, 0.0), (len(bones), 1)))
+    return heads_bl, leaf_dirs
+
+def bone_rest_pose(bones, leaf_length_from_parent=False):
+    """Kemik listesi için Blender uzayında head ve tail dizilerini (Nx3) tek seferde hesapla"""
+    import numpy as np
+    n = len(bones)
+    heads_bl, leaf_dirs = bone_rest_arrays(bones)
+    row_of = {b['name']: i for i, b in enumerate(bones)}
+    parent_rows = np.fromiter((row_of.get(b.get('parent') or "", -1) for b in bones), dtype=np.int64, count=n)
+    has_parent = parent_rows >= 0
+
+    # Çocuklu kemik: tail çocuk head'lerinin ortalamasına bakar
+    child_sum = np.zeros((n, 3))
+    np.add.at(child_sum, parent_rows[has_parent], heads_bl[has_parent])
+    child_count = np.bincount(parent_rows[has_parent], minlength=n)
+    tails_bl = child_sum / np.maximum(child_count, 1)[:, None]
+    _fix_short_bones(heads_bl, tails_bl)
+
+    # Yaprak kemik: rotasyon yönünde 5.0; istenirse (dosyada önce gelen) ebeveyn uzunluğunun yarısı
+    leaf_len = np.full(n, 5.0)
+    if leaf_length_from_parent:
+        use_parent = has_parent & (parent_rows < np.arange(n))
+        parent_len = np.linalg.norm(tails_bl - heads_bl, axis=1)
+        leaf_len[use_parent] = parent_len[parent_rows[use_parent]] * 0.5
+    is_leaf = child_count == 0
+    tails_bl[is_leaf] = heads_bl[is_leaf] + leaf_dirs[is_leaf] * leaf_len[is_leaf, None]
+    _fix_short_bones(heads_bl, tails_bl)
+    return heads_bl, tails_bl
+
+def _fix_short_bones(heads_bl, tails_bl):
+    """Blender sıfır uzunluklu kemikleri siler; çok kısa kemiklere +Y yönünde 0.1 uzunluk ver"""
+    import numpy as np
+    short = np.linalg.norm(tails_bl - heads_bl, axis=1) < 0.001
+    tails_bl[short] = heads_bl[short] + (0.0, 0.1, 0.0)
+
+# bind_to_skeleton'daki yüksek index eşlemesi için kemik grubu anahtar kelimeleri
+_SPINE_KEYS = ('Spine', 'Neck', 'Head')
+_ARM_KEYS = ('Arm', 'Hand', 'Finger', 'Clavicle')
+_LEG_KEYS = ('Thigh', 'Calf', 'Foot', 'Toe', 'HorseLink')
+_TAIL_KEYS = ('Tail', 'Ponytail')
+
+def build_bone_adjacency(bones):
+    """Kemik ağacını düz dizilere çevir: (isim→index, parent index (-1 = kök), CSR children_start, children_idx)"""
+    import numpy as np
+    name_to_i = {b['name']: i for i, b in enumerate(bones)}
+    parent_i = np.fromiter((name_to_i.get(b.get('parent') or "", -1) for b in bones), dtype=np.int32, count=len(bones))
+    has_parent = parent_i >= 0
+    children_start = np.zeros(len(bones) + 1, dtype=np.int32)
+    children_start[1:] = np.cumsum(np.bincount(parent_i[has_parent], minlength=len(bones)))
+    # Stable sıralama aynı ebeveynin çocuklarını dosya sırasında tutar
+    child_rows = np.nonzero(has_parent)[0]
+    children_idx = child_rows[np.argsort(parent_i[has_parent], kind='stable')].astype(np.int32)
+    return name_to_i, parent_i, children_start, children_idx
+
+# ============================================================================
+# Mesh Veri Yazma Yardımcıları
+# ============================================================================
+def fill_mesh_geometry(mesh, verts, faces):
+    """Vertex ve üçgen verisini foreach_set ile mesh'e toplu yaz (from_pydata yerine)"""
+    import numpy as np
+    co = np.ascontiguousarray(verts, dtype=np.float32).reshape(-1)
+    loop_verts = np.ascontiguousarray(faces, dtype=np.int32).reshape(-1)
+    face_count = len(loop_verts) // 3
+
+    mesh.vertices.add(len(co) // 3)
+    mesh.vertices.foreach_set("co", co)
+
+    mesh.loops.add(len(loop_verts))
+    mesh.loops.foreach_set("vertex_index", loop_verts)
+
+    mesh.polygons.add(face_count)
+    mesh.polygons.foreach_set("loop_start", np.arange(0, len(loop_verts), 3, dtype=np.int32))
+    # Blender 4.0+ loop_total'ı loop_start'tan türetir (salt okunur)
+    if bpy.app.version < (4, 0, 0):
+        mesh.polygons.foreach_set("loop_total", np.full(face_count, 3, dtype=np.int32))
+    # mesh.update(calc_edges=True) çağıran tarafta, UV vb. yazıldıktan sonra bir kez yapılır
+
+def reuse_or_new_mesh(name, reuse=False):
+    """reuse açıksa aynı isimli sahipsiz (users == 0) mesh'i boşaltıp kullan, yoksa yeni oluştur"""
+    mesh = bpy.data.meshes.get(name) if reuse else None
+    if mesh is not None and mesh.users == 0:
+        mesh.clear_geometry()
+        return mesh
+    return bpy.data.meshes.new(name)
+
+def reuse_or_new_object(name, data, reuse=False):
+    """reuse açıksa aynı isimli sahipsiz objeyi temizleyip yeni veriye bağla, yoksa yeni obje oluştur"""
+    obj = bpy.data.objects.get(name) if reuse else None
+    if obj is not None and obj.users == 0 and type(obj.data) is type(data):
+        obj.data = data
+        obj.parent = None
+        obj.modifiers.clear()
+        obj.vertex_groups.clear()
+        return obj
+    return bpy.data.objects.new(name, data)
+
+def new_armature_object(context, name, reuse=False):
+    """Boş bir armature objesi oluşturup aktif koleksiyona bağla (bpy.ops.object.armature_add yerine)"""
+    armature_data = bpy.data.armatures.get(name) if reuse else None
+    if armature_data is None or armature_data.users != 0:
+        armature_data = bpy.data.armatures.new(name)
+    armature_obj = reuse_or_new_object(name, armature_data, reuse)
+    context.collection.objects.link(armature_obj)
+    return armature_obj
+
+def clear_edit_bones(armature_data):
+    """Yeniden kullanılan armature'ın eski kemiklerini sil (EDIT modda çağrılmalı)"""
+    for edit_bone in list(armature_data.edit_bones):
+        armature_data.edit_bones.remove(edit_bone)
+
+def deselect_for_armature_edit(context):
+    """OBJECT moda dön ve yalnızca seçili objelerin seçimini kaldır (sahne taraması yok)"""
+    if context.object and context.object.mode != 'OBJECT':
+        bpy.ops.object.mode_set(mode='OBJECT')
+    for obj in context.selected_objects:
+        obj.select_set(False)
+
+def select_only(context, active, *extra):
+    """Yalnızca seçili objeleri bırak (sahne taraması yok), active + extra'yı seç ve active yap"""
+    for obj in context.selected_objects:
+        obj.select_set(False)
+    for obj in (active,) + extra:
+        obj.select_set(True)
+    context.view_layer.objects.active = active
+
+def find_view3d_region(context):
+    """İlk VIEW_3D alanını ve WINDOW bölgesini bul: (window, screen, area, region) ya da None"""
+    win = context.window
+    scr = win.screen if win else None
+    if not scr:
+        return None
+    area = next((a for a in scr.areas if a.type == 'VIEW_3D'), None)
+    region = next((r for r in area.regions if r.type == 'WINDOW'), None) if area else None
+    return (win, scr, area, region) if region else None
+
+def fill_mesh_uvs(mesh, uvs, faces):
+    """Vertex başına UV'leri loop sırasına açıp tek foreach_set ile yeni UV katmanına yaz"""
+    import numpy as np
+    loop_verts = np.ascontiguousarray(faces).reshape(-1)
+    loop_uvs = np.ascontiguousarray(uvs, dtype=np.float32)[loop_verts]
+    uv_layer = mesh.uv_layers.new(name="UVMap")
+    uv_layer.data.foreach_set("uv", loop_uvs.reshape(-1))
+
+def points_bounds(points):
+    """Nx3 nokta dizisinin (min, max) köşelerini Vector olarak döndür (boşsa ±inf)"""
+    if len(points) == 0:
+        return Vector((float('inf'),) * 3), Vector((float('-inf'),) * 3)
+    return Vector(points.min(axis=0)), Vector(points.max(axis=0))
+
+def mesh_vertex_bounds(mesh_objects):
+    """Mesh'lerin yerel vertex koordinatlarının sınır kutusu (vertex başına Vector oluşturmadan)"""
+    import numpy as np
+    chunks = []
+    for mesh_obj in mesh_objects:
+        vertices = mesh_obj.data.vertices
+        co = np.empty(len(vertices) * 3, dtype=np.float32)
+        vertices.foreach_get("co", co)
+        chunks.append(co.reshape(-1, 3))
+    return points_bounds(np.concatenate(chunks) if chunks else np.empty((0, 3), dtype=np.float32))
+
+def armature_rest_bounds(armature_obj):
+    """Armature'ın rest head/tail noktalarının yerel sınır kutusu (OBJECT modda, foreach_get ile)"""
+    import numpy as np
+    bones = armature_obj.data.bones
+    heads = np.empty(len(bones) * 3, dtype=np.float32)
+    tails = np.empty(len(bones) * 3, dtype=np.float32)
+    bones.foreach_get("head_local", heads)
+    bones.foreach_get("tail_local", tails)
+    return points_bounds(np.concatenate((heads, tails)).reshape(-1, 3))
+
+def ensure_vertex_groups(obj, names):
+    """Eksik vertex group'ları tek geçişte oluştur; isim → VertexGroup sözlüğü döndür"""
+    vg_map = {vg.name: vg for vg in obj.vertex_groups}
+    for name in names:
+        if name not in vg_map:
+            vg_map[name] = obj.vertex_groups.new(name=name)
+    return vg_map
+
+def add_vertex_group_weights(vg, vert_indices, weights, quant_bits=0):
+    """Aynı ağırlığı paylaşan vertex'leri tek vg.add çağrısıyla yaz (vertex başına çağrı yerine)"""
+    import numpy as np
+    # Aynı vertex birden fazla slotta aynı kemiğe bağlıysa ağırlıklar toplanır ('ADD' davranışı)
+    verts, inverse = np.unique(np.asarray(vert_indices, dtype=np.int64), return_inverse=True)
+    summed = np.bincount(inverse, weights=np.asarray(weights, dtype=np.float64))
+    # quant_bits > 0: ağırlıklar 2^bits seviyeye yuvarlanır, daha az çağrı; 0: tam değerler
+    if quant_bits > 0:
+        levels = (1 << quant_bits) - 1
+        summed = np.round(summed * levels) / levels
+    bin_weights, bin_of = np.unique(summed, return_inverse=True)
+    order = np.argsort(bin_of, kind='stable')
+    groups = np.split(verts[order], np.cumsum(np.bincount(bin_of))[:-1])
+    for weight, group in zip(bin_weights.tolist(), groups):
+        if weight > 0.0:
+            vg.add(group.tolist(), weight, 'REPLACE')
+
+# ============================================================================
+# BMS Vertex Düzeni
+# ============================================================================
+# Kayıt düzeni sürüme değil vertex_flag'e bağlıdır; flag başına bir kez kurulur
+_BMS_VERTEX_DTYPES = {}
+
+def bms_vertex_dtype(vertex_flag):
+    """vertex_flag için BMS vertex kaydının structured dtype'ını döndür (önbellekli)"""
+    import numpy as np
+    key = vertex_flag & 0xC00
+    dtype = _BMS_VERTEX_DTYPES.get(key)
+    if dtype is None:
+        # Vertex kaydı: pos(3f) normal(3f) uv(2f) float idx(4B) weight(4B) + flag'e bağlı ek veri
+        stride = 44
+        if key & 0x400:
+            stride += 8  # uv1
+        if key & 0x800:
+            stride += 32  # morph
+        dtype = np.dtype({
+            'names': ['pos', 'normal', 'uv', 'idx', 'w'],
+            'formats': [('<f4', 3), ('<f4', 3), ('<f4', 2), ('u1', 4), ('u1', 4)],
+            'offsets': [0, 12, 24, 36, 40],
+            'itemsize': stride,
+        })
+        _BMS_VERTEX_DTYPES[key] = dtype
+    return dtype
+
+# ============================================================================
+# BMS Ayrıştırma Önbelleği
+# ============================================================================
+# import_bms çıktı formatı değişince artırılmalı; eski önbellek dosyaları geçersiz olur
+BMS_PARSER_VERSION = 3
+
+def _bms_cache_path(path):
+    """(mutlak yol, mtime, parser sürümü) anahtarından .npz önbellek yolunu üret"""
+    abs_path = os.path.abspath(path)
+    key = f"{abs_path}|{os.stat(abs_path).st_mtime_ns}|{BMS_PARSER_VERSION}"
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+    return os.path.join(bpy.app.tempdir or os.path.dirname(abs_path), f"bms_{digest}.npz")
+
+def load_cached_bms(path):
+    """Önbellekte varsa ayrıştırılmış BMS verisini döndür, yoksa None"""
+    import numpy as np
+    try:
+        cache_path = _bms_cache_path(path)
+        if not os.path.exists(cache_path):
+            return None
+        with np.load(cache_path) as arrs:
+            mesh_data = {k: arrs[k] for k in arrs.files}
+        mesh_data['name'] = str(mesh_data['name'])
+        mesh_data['material_name'] = str(mesh_data['material_name'])
+        return mesh_data
+    except Exception as e:
+        print(f"  ⚠️  BMS cache read failed for {os.path.basename(path)}: {e}")
+        return None
+
+def save_cached_bms(path, mesh_data):
+    """Ayrıştırılmış BMS verisini sıkıştırmasız .npz olarak kaydet"""
+    import numpy as np
+    try:
+        np.savez(_bms_cache_path(path), **mesh_data)
+    except Exception as e:
+        print(f"  ⚠️  BMS cache write failed for {os.path.basename(path)}: {e}")
+
+# ============================================================================
+# DDJ Texture Yardımcıları
+# ============================================================================
+def _read_ddj_payload(path):
+    """DDJ başlığını doğrula ve gömülü görüntü verisini döndür"""
+    # Dosya tek read() ile okunur; başlık alanları aynı buffer'dan çözülür
+    with open(path, 'rb') as file:
+        return _ddj_payload(memoryview(file.read()))
+
+def _ddj_payload(data):
+    """Okunmuş DDJ dosyası (memoryview) içinden gömülü görüntü verisini döndür; geçersizse None"""
+    sig = str(data[0:12], 'utf-8', 'replace')
+    if sig != "JMXVDDJ 1000":
+        return None
+    
+    size = _S_U32.unpack_from(data, 12)[0]
+    # 16..20: texture type (kullanılmıyor)
+    return data[20:20 + size]
+
+@functools.lru_cache(maxsize=1024)
+def ddj_name_for_texture(diff_path):
+    """Materyal texture yolundan (DDJ dosya adı, küçük harf arama anahtarı); tekrarlanan yollar önbellekten"""
+    ddj_filename = os.path.splitext(os.path.basename(diff_path))[0] + '.ddj'
+    return ddj_filename, ddj_filename.lower()
+
+# (mutlak yol, mtime_ns, boyut) -> PNG yolu; değişmeyen DDJ oturum boyunca bir kez dönüştürülür
+_ddj_png_cache = {}
+
+def _convert_ddj_to_png(abs_path):
+    """DDJ'yi PNG'ye dönüştür (bpy kullanmaz, thread havuzunda çalışabilir)"""
+    if VERBOSE_DEBUG:
+        print(f"    🖼️  Converting: {os.path.basename(abs_path)}")
+    
+    try:
+        # Dosya bir kez açılır: önce başlık + gömülü verinin ilk baytları (çıktı uzantısı için),
+        # çıktı eskiyse aynı tanıtıcıdan tüm dosya okunur
+        with open(abs_path, 'rb') as file:
+            head = file.read(28)
+            if head[:12] != b"JMXVDDJ 1000":
+                return None
+            is_png = head[20:28] == b'\x89PNG\r\n\x1a\n'
+            is_jpeg = head[20:23] == b'\xff\xd8\xff'
+            
+            # Yalnızca uzantı değişir (klasör adlarındaki '.ddj' ya da büyük harfli '.DDJ' etkilenmez)
+            png_path = os.path.splitext(abs_path)[0] + ('.jpg' if is_jpeg else '.png')
+            # Diskteki çıktı DDJ'den yeniyse (önceki oturumdan) dönüşüm atlanır
+            if os.path.exists(png_path) and os.path.getmtime(png_path) >= os.fstat(file.fileno()).st_mtime:
+                if VERBOSE_DEBUG:
+                    print(f"    ✓ Up to date: {os.path.basename(png_path)}")
+                return png_path
+            
+            file.seek(0)
+            buffer = _ddj_payload(memoryview(file.read()))
+        if buffer is None:
+            return None
+        
+        # Gömülü veri zaten PNG/JPEG ise decode/encode yok, baytlar olduğu gibi yazılır
+        if is_png or is_jpeg:
+            with open(png_path, 'wb') as out:
+                out.write(buffer)
+        else:
+            img = Image.open(io.BytesIO(buffer))
+            img.save(png_path)
+        
+        if VERBOSE_DEBUG:
+            print(f"    ✓ Saved: {os.path.basename(png_path)}")
+        return png_path
+        
+    except Exception as e:
+        print(f"    ✗ Failed: {e}")
+        return None
+
+def _map_ddj_conversion(abs_paths):
+    """Dönüşümü thread havuzunda çalıştır (PIL decode/encode ve dosya G/Ç'si GIL'i bırakır); tek dosyada seri"""
+    if len(abs_paths) > 1:
+        try:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=min(len(abs_paths), os.cpu_count() or 1)) as ex:
+                return list(ex.map(_convert_ddj_to_png, abs_paths))
+        except Exception as e:
+            print(f"  ⚠️  Parallel DDJ conversion failed, falling back to serial: {e}")
+    return [_convert_ddj_to_png(p) for p in abs_paths]
+
+def convert_ddj_files(paths):
+    """DDJ dosyalarını PNG'ye dönüştür; önbellekte olmayanlar toplu işlenir. {path: png_path}"""
+    keys = {}
+    for p in paths:
+        st = os.stat(p)
+        keys[p] = (os.path.abspath(p), st.st_mtime_ns, st.st_size)
+    pending = []
+    for key in dict.fromkeys(keys.values()):
+        png_path = _ddj_png_cache.get(key)
+        # PNG sonradan silinmişse yeniden dönüştür
+        if png_path is None or not os.path.exists(png_path):
+            pending.append(key)
+    
+    if pending:
+        results = _map_ddj_conversion([key[0] for key in pending])
+        # Yalnızca başarılı dönüşümler önbelleğe alınır; başarısızlar sonraki importta yeniden denenir
+        _ddj_png_cache.update((key, png) for key, png in zip(pending, results) if png)
+    
+    return {p: _ddj_png_cache.get(key) for p, key in keys.items()}
+
+def load_texture_image(path):
+    """PNG'yi yükle; aynı dosyayı paylaşan materyaller tek Image datablock'u kullanır, dosya değiştiyse yeniden okunur"""
+    # realpath: '..'/symlink farkı olan yollar da aynı datablock'a düşer
+    path = os.path.realpath(path)
+    image = bpy.data.images.load(path, check_existing=True)
+    # check_existing eski pikselleri döndürebilir: DDJ yeniden dönüştürüldüyse (mtime değişti) diskten tazele
+    mtime = os.path.getmtime(path)
+    stored = image.get("source_mtime")
+    if stored != mtime:
+        if stored is not None or image.has_data:
+            image.reload()
+        image["source_mtime"] = mtime
+    return image
+
+def load_ddj_image(path):
+    """DDJ'yi diske PNG yazmadan Blender Image olarak yükle (pixels.foreach_set ile)"""
+    import numpy as np
+    try:
+        buffer = _read_ddj_payload(path)
+        if buffer is None:
+            return None
+        
+        rgba = Image.open(io.BytesIO(buffer)).convert('RGBA')
+        width, height = rgba.size
+        # Blender pikselleri alttan üste ve [0, 1] aralığında float bekler
+        pixels = np.asarray(rgba, dtype=np.uint8)[::-1].astype(np.float32) * (1.0 / 255.0)
+        
+        image = bpy.data.images.new(os.path.splitext(os.path.basename(path))[0], width, height, alpha=True)
+        image.pixels.foreach_set(pixels.ravel())
+        image.pack()
+        
+        if VERBOSE_DEBUG:
+            print(f"    ✓ Loaded in memory: {image.name}")
+        return image
+        
+    except Exception as e:
+        print(f"    ✗ In-memory load failed: {e}")
+        return None
+
+# BMT içerik anahtarı → oluşturulan Blender materyal adı; her import başında temizlenir
+_mat_cache = {}
+
+# Armature adı → (kemik isimleri, kemik grupları); her import başında temizlenir
+_bone_lookup_cache = {}
+
+def bone_lookup(armature_obj):
+    """Kemik isimlerini ve yüksek index eşlemesi gruplarını armature başına bir kez hesapla"""
+    bones = armature_obj.data.bones
+    cached = _bone_lookup_cache.get(armature_obj.name)
+    if cached is not None and len(cached[0]) == len(bones):
+        return cached
+    bone_names = [bone.name for bone in bones]
+    spine_bones, arm_bones, leg_bones, tail_bones, other_bones = [], [], [], [], []
+    for i, name in enumerate(bone_names):
+        # Tek geçiş; gruplar bağımsızdır, bir isim birden fazla gruba girebilir
+        if any(k in name for k in _SPINE_KEYS):
+            spine_bones.append(i)
+        if any(k in name for k in _ARM_KEYS):
+            arm_bones.append(i)
+        if any(k in name for k in _LEG_KEYS):
+            leg_bones.append(i)
+        if any(k in name for k in _TAIL_KEYS):
+            tail_bones.append(i)
+        if name.startswith('Bone'):
+            other_bones.append(i)
+    cached = (bone_names, (spine_bones, arm_bones, leg_bones, tail_bones, other_bones))
+    _bone_lookup_cache[armature_obj.name] = cached
+    return cached
+
+def _on_auto_convert_ddj_update(self, context):
+    """Auto DDJ ayarı değişince dönüşüm önbelleğini geçersiz kıl"""
+    _ddj_png_cache.clear()
 
 # ============================================================================
 # Property Groups & UI Sınıfları
@@ -60,12 +534,21 @@ class GameImporterSettings(PropertyGroup):
     bmt_file: StringProperty(name="BMT File", subtype='FILE_PATH')
     bsk_file: StringProperty(name="BSK File", subtype='FILE_PATH')
     combine_meshes: BoolProperty(name="Combine Meshes", default=True)
+    use_parse_cache: BoolProperty(name="Cache Parsed BMS", default=True)
+    parent_armatures_to_mesh: BoolProperty(name="Parent Armatures to Mesh", default=False,
+                                           description="Group armatures by parenting them to the mesh instead of moving them into a rig collection")
+    reuse_existing: BoolProperty(name="Reuse Orphan Data-blocks", default=False,
+                                 description="Refill unused meshes/armatures left by a previous import instead of creating new ones")
+    weight_quant_bits: IntProperty(name="Weight Quantization Bits", default=0, min=0, max=16,
+                                   description="Round skin weights to 2^bits levels to batch vertex group writes (0 = exact weights; rounding can break per-vertex sum = 1)")
     apply_materials: BoolProperty(name="Apply Materials", default=True)
-    auto_convert_ddj: BoolProperty(name="Auto Convert DDJ", default=True)
+    auto_convert_ddj: BoolProperty(name="Auto Convert DDJ", default=True, update=_on_auto_convert_ddj_update)
     import_skeleton: BoolProperty(name="Import Skeleton", default=True)
     bind_mesh: BoolProperty(name="Bind Mesh to Skeleton", default=True)
     split_armatures: BoolProperty(name="Split skeleton chains into separate armatures", default=False)
     split_root_children: BoolProperty(name="If single root, split by its children", default=True)
+    verbose_debug: BoolProperty(name="Verbose Debug Output", default=False,
+                                description="Print per-bone, per-material and per-texture debug lines to the console (slower on large imports)")
 
 # ============================================================================
 # Main Importer
@@ -77,6 +560,13 @@ class GameImporter(Operator):
     
     def execute(self, context):
         settings = context.scene.game_importer_settings
+        global VERBOSE_DEBUG
+        VERBOSE_DEBUG = settings.verbose_debug
+        _mat_cache.clear()
+        _bone_lookup_cache.clear()
+        # Dosya listelerini bir kez düz Python listesine al (her .path erişimi RNA'ya iner)
+        bms_paths = [item.path for item in settings.bms_files]
+        ddj_paths = [item.path for item in settings.ddj_files]
         try:
             created_armature = None
             created_armatures = []
@@ -86,7 +576,8 @@ class GameImporter(Operator):
             # STEP 1: Import Skeleton (BSK)
             if settings.import_skeleton and settings.bsk_file and os.path.exists(settings.bsk_file):
                 self.report({'INFO'}, "Importing skeleton...")
-                result = self.import_bsk(context, settings.bsk_file, settings.split_armatures)
+                result = self.import_bsk(context, settings.bsk_file, settings.split_armatures,
+                                         settings.split_root_children, settings.reuse_existing)
                 # import_bsk may return a single armature or a list if split is enabled
                 if isinstance(result, list):
                     created_armatures = result
@@ -99,27 +590,27 @@ class GameImporter(Operator):
                         self.report({'INFO'}, f"✓ Skeleton: {created_armature.name}")
             
             # STEP 2: Import Meshes (BMS)
-            if len(settings.bms_files) > 0:
+            if bms_paths:
                 self.report({'INFO'}, "Importing meshes...")
-                for item in settings.bms_files:
-                    if item.path and os.path.exists(item.path):
-                        mesh_data = self.import_bms(item.path)
+                for path in bms_paths:
+                    if path and os.path.exists(path):
+                        mesh_data = self.import_bms(path, settings.use_parse_cache)
                         if mesh_data:
                             all_mesh_data.append(mesh_data)
                 
                 if all_mesh_data:
                     if settings.combine_meshes:
                         name = all_mesh_data[0].get('name', 'CombinedMesh')
-                        obj = self.create_combined_mesh(context, all_mesh_data, name)
+                        obj = self.create_combined_mesh(context, all_mesh_data, name, settings.reuse_existing)
                         created_meshes.append(obj)
                         self.report({'INFO'}, f"✓ Combined mesh '{name}' created")
                     else:
                         for mesh_data in all_mesh_data:
-                            obj = self.create_mesh_object(context, mesh_data)
+                            obj = self.create_mesh_object(context, mesh_data, settings.reuse_existing)
                             created_meshes.append(obj)
                         self.report({'INFO'}, f"✓ Created {len(created_meshes)} separate objects")
             
-            # Armature'ı organizasyon için mesh altında topla ve aynı konuma getir
+            # Armature'ı organizasyon için mesh yanında topla
             try:
                 if created_meshes:
                     host_mesh = created_meshes[0]
@@ -128,17 +619,32 @@ class GameImporter(Operator):
                         targets.append(created_armature)
                     if created_armatures:
                         targets.extend(created_armatures)
-                    for arm in targets:
-                        if arm is None:
-                            continue
-                        # Dünya konumunu KORUYARAK mesh altına al
-                        try:
-                            world_mx = arm.matrix_world.copy()
-                            arm.parent = host_mesh
-                            arm.matrix_parent_inverse = host_mesh.matrix_world.inverted()
-                            arm.matrix_world = world_mx
-                        except Exception:
-                            pass
+                    targets = [arm for arm in dict.fromkeys(targets) if arm is not None]
+                    if settings.parent_armatures_to_mesh:
+                        for arm in targets:
+                            # Dünya konumunu KORUYARAK mesh altına al
+                            try:
+                                world_mx = arm.matrix_world.copy()
+                                arm.parent = host_mesh
+                                arm.matrix_parent_inverse = host_mesh.matrix_world.inverted()
+                                arm.matrix_world = world_mx
+                            except Exception:
+                                pass
+                    elif targets:
+                        # Hiyerarşi derinleşmesin: armature'lar mesh'in koleksiyonu altındaki
+                        # bir alt koleksiyona taşınır, transformları değişmez
+                        parent_col = host_mesh.users_collection[0] if host_mesh.users_collection else context.collection
+                        # reuse_existing: tekrar importta _rig.001, _rig.002 ... birikmesin
+                        rig_name = f"{host_mesh.name}_rig"
+                        rig_col = bpy.data.collections.get(rig_name) if settings.reuse_existing else None
+                        if rig_col is None:
+                            rig_col = bpy.data.collections.new(rig_name)
+                        if rig_col.name not in parent_col.children:
+                            parent_col.children.link(rig_col)
+                        for arm in targets:
+                            for col in list(arm.users_collection):
+                                col.objects.unlink(arm)
+                            rig_col.objects.link(arm)
             except Exception:
                 pass
 
@@ -146,12 +652,19 @@ class GameImporter(Operator):
             if settings.apply_materials and settings.bmt_file and os.path.exists(settings.bmt_file):
                 self.report({'INFO'}, "Importing materials...")
                 # Collect DDJ files from list
-                ddj_files = [item.path for item in settings.ddj_files if item.path and os.path.exists(item.path)]
+                ddj_files = [path for path in ddj_paths if path and os.path.exists(path)]
                 materials = self.import_bmt(settings.bmt_file, ddj_files, settings.auto_convert_ddj)
                 if materials and created_meshes:
+                    # Blender adı (ve .001 eki olmadan taban adı) → Material; obje başına tarama yapılmaz
+                    mat_by_name = {}
+                    for mat in dict.fromkeys(materials.values()):
+                        base, _, suffix = mat.name.rpartition('.')
+                        if base and suffix.isdigit():
+                            mat_by_name.setdefault(base, mat)
+                        mat_by_name[mat.name] = mat
                     for obj in created_meshes:
-                        self.apply_materials_to_obj(obj, materials)
-                    self.report({'INFO'}, f"✓ {len(materials)} materials applied")
+                        self.apply_materials_to_obj(obj, materials, mat_by_name)
+                    self.report({'INFO'}, f"✓ {len(set(materials.values()))} materials applied")
             
             # STEP 4: Bind Mesh to Skeleton (BEFORE scaling!)
             if settings.bind_mesh and created_meshes and all_mesh_data:
@@ -159,20 +672,20 @@ class GameImporter(Operator):
                 if created_armature and not created_armatures:
                     # Single armature
                     if settings.combine_meshes:
-                        self.bind_to_skeleton(created_meshes[0], created_armature, all_mesh_data)
+                        self.bind_to_skeleton(created_meshes[0], created_armature, all_mesh_data, settings.weight_quant_bits)
                     else:
                         for obj, data in zip(created_meshes, all_mesh_data):
-                            self.bind_to_skeleton(obj, created_armature, [data])
+                            self.bind_to_skeleton(obj, created_armature, [data], settings.weight_quant_bits)
                 elif created_armatures:
                     # Multiple armatures - bind to all of them for complete bone coverage
                     self.report({'INFO'}, f"Binding meshes to {len(created_armatures)} armatures...")
                     for i, arm in enumerate(created_armatures):
                         print(f"  Binding to armature {i+1}: {arm.name}")
                         if settings.combine_meshes:
-                            self.bind_to_skeleton(created_meshes[0], arm, all_mesh_data)
+                            self.bind_to_skeleton(created_meshes[0], arm, all_mesh_data, settings.weight_quant_bits)
                         else:
                             for obj, data in zip(created_meshes, all_mesh_data):
-                                self.bind_to_skeleton(obj, arm, [data])
+                                self.bind_to_skeleton(obj, arm, [data], settings.weight_quant_bits)
                 self.report({'INFO'}, "✓ Meshes bound to skeleton")
             
             # STEP 5: Fit Armature to Mesh (AFTER binding!)
@@ -201,79 +714,81 @@ class GameImporter(Operator):
             traceback.print_exc()
             return {'CANCELLED'}
 
-    def import_bsk(self, context, filepath, split_armatures=False):
+    def import_bsk(self, context, filepath, split_armatures=False, split_children_pref=True, reuse=False):
         """Import BSK skeleton - FIXED VERSION"""
         print(f"\n🦴 Importing BSK: {filepath}")
         
         try:
             with open(filepath, 'rb') as file:
-                # Read signature
-                signature = file.read(12).decode('utf-8', errors='replace')
-                if not signature.startswith("JMXVBSK"):
-                    self.report({'ERROR'}, f"Invalid BSK signature: {signature}")
-                    return None
+                data = memoryview(file.read())
+            
+            # Read signature
+            signature = str(data[0:12], 'utf-8', 'replace')
+            if not signature.startswith("JMXVBSK"):
+                self.report({'ERROR'}, f"Invalid BSK signature: {signature}")
+                return None
+            
+            print(f"  Signature: {signature}")
+            
+            # Read bone count
+            bone_count = _S_U32.unpack_from(data, 12)[0]
+            off = 16
+            print(f"  Bone Count: {bone_count}")
+            
+            bones_data = []
+            for i in range(bone_count):
+                # Bone type (1 byte, kullanılmıyor)
+                off += 1
+                
+                # Bone name
+                name_len = _S_U32.unpack_from(data, off)[0]
+                off += 4
+                name = str(data[off:off + name_len], 'utf-8', 'replace')
+                off += name_len
                 
-                print(f"  Signature: {signature}")
+                # Parent name
+                parent_len = _S_U32.unpack_from(data, off)[0]
+                off += 4
+                parent = str(data[off:off + parent_len], 'utf-8', 'replace') if parent_len > 0 else ""
+                off += parent_len
                 
-                # Read bone count
-                bone_count = struct.unpack('I', file.read(4))[0]
-                print(f"  Bone Count: {bone_count}")
+                # rot_origin and trans_origin (this is what we need!) tek unpack ile;
+                # rot_parent/trans_parent ve rot_local/trans_local atlanır
+                blk = _S_BSK_BONE_BLK.unpack_from(data, off)
+                rot = blk[0:4]
+                trans = blk[4:7]
+                off += _S_BSK_BONE_BLK.size
                 
-                bones_data = []
-                for i in range(bone_count):
-                    # Bone type
-                    bone_type = struct.unpack('B', file.read(1))[0]
-                    
-                    # Bone name
-                    name_len = struct.unpack('I', file.read(4))[0]
-                    name = file.read(name_len).decode('utf-8', errors='replace')
-                    
-                    # Parent name
-                    parent_len = struct.unpack('I', file.read(4))[0]
-                    parent = file.read(parent_len).decode('utf-8', errors='replace') if parent_len > 0 else ""
-                    
-                    # Skip rot_parent and trans_parent (not used in simple import)
-                    file.read(16)  # rot_parent (quaternion)
-                    file.read(12)  # trans_parent (vector3)
-                    
-                    # Read rot_origin and trans_origin (this is what we need!)
-                    rot = struct.unpack('4f', file.read(16))
-                    trans = struct.unpack('3f', file.read(12))
-                    
-                    # Skip rot_local and trans_local
-                    file.read(16)  # rot_local
-                    file.read(12)  # trans_local
-                    
-                    # Skip children list
-                    child_count = struct.unpack('I', file.read(4))[0]
-                    for j in range(child_count):
-                        child_len = struct.unpack('I', file.read(4))[0]
-                        file.read(child_len)
-                    
-                    bones_data.append({
-                        'name': name,
-                        'parent': parent,
-                        'rotation': rot,
-                        'translation': trans
-                    })
-                    
+                # Skip children list
+                child_count = _S_U32.unpack_from(data, off)[0]
+                off += 4
+                for j in range(child_count):
+                    child_len = _S_U32.unpack_from(data, off)[0]
+                    off += 4 + child_len
+                
+                bones_data.append({
+                    'index': i,  # Dosyadaki sıra (split ve single yollarında ortak)
+                    'name': name,
+                    'parent': parent,
+                    'rotation': rot,
+                    'translation': trans
+                })
+                
+                if VERBOSE_DEBUG:
                     print(f"  Bone {i}: {name} → parent: {parent}")
             
             # UI'dan gelen split_armatures tercihini kullan
-            return self.create_armature(context, bones_data, split_armatures)
+            return self.create_armature(context, bones_data, split_armatures, split_children_pref, reuse)
             
         except Exception as e:
             self.report({'ERROR'}, f"BSK import failed: {e}")
             traceback.print_exc()
             return None
 
-    def create_armature(self, context, bones_data, split_armatures=False):
+    def create_armature(self, context, bones_data, split_armatures=False, split_children_pref=True, reuse=False):
         """Create armature - FIXED with proper Blender API usage"""
+        import numpy as np
         print(f"  Creating armature with {len(bones_data)} bones...")
-        # Index bilgisini baştan sabitle (split ve single yollarında tutarlılık için)
-        for idx, b in enumerate(bones_data):
-            b['index'] = idx
-
         # İsteğe bağlı: skeleton'ı zincirlerine göre parçalara ayır
         if split_armatures:
             # Build quick lookup
@@ -315,11 +830,6 @@ class GameImporter(Operator):
                     target_branch = descend_to_first_branch(single_root)
 
                 # If UI allows forcing child split, or we found a branching node
-                try:
-                    split_children_pref = bpy.context.scene.game_importer_settings.split_root_children
-                except Exception:
-                    split_children_pref = True
-
                 if target_branch is not None and split_children_pref:
                     branch_children = children_map_tmp.get(target_branch, [])
                     if branch_children:
@@ -331,133 +841,60 @@ class GameImporter(Operator):
 
             print(f"  Splitting skeleton into {len(split_roots)} armature objects (by dynamic branches)...")
 
-            created_armatures = []
+            # Ağaç bir kez düz dizilere çevrilir; alt ağaç toplama index yürüyüşüdür
+            name_to_i, _, children_start, children_idx = build_bone_adjacency(bones_data)
 
-            def collect_subtree(root_name):
+            def collect_subtree(root_i):
                 selected = []
-                children_map = {}
-                for bone in bones_data:
-                    p = bone.get('parent') or ""
-                    if p not in children_map:
-                        children_map[p] = []
-                    children_map[p].append(bone)
-
-                stack = [root_name]
-                seen = set()
+                stack = [root_i]
+                seen = np.zeros(len(bones_data), dtype=bool)
                 while stack:
                     current = stack.pop()
-                    if current in seen:
+                    if seen[current]:
                         continue
-                    seen.add(current)
-                    bone = name_to_bone.get(current)
-                    if bone:
-                        selected.append(bone)
-                        for child in children_map.get(current, []):
-                            stack.append(child['name'])
+                    seen[current] = True
+                    selected.append(bones_data[current])
+                    stack.extend(children_idx[children_start[current]:children_start[current + 1]].tolist())
                 return selected
 
-            for root in split_roots:
-                subtree = collect_subtree(root)
-                if not subtree:
-                    continue
-                arm_obj = self._create_single_armature(context, subtree)
-                if arm_obj:
-                    created_armatures.append(arm_obj)
+            subtrees = [s for s in (collect_subtree(name_to_i[root]) for root in split_roots if root in name_to_i) if s]
 
             # Ek olarak: Tam iskeleti de tek bir armature olarak oluştur (bind için referans)
             # Böylece mesh tek Armature modifier ile doğru indeksleme ile deforme olur
-            combined_armature = self._create_single_armature(context, bones_data)
+            # Tüm parçalar tek bir EDIT mod oturumunda oluşturulur
+            armature_objs = self._create_armature_objects(context, subtrees + [bones_data], reuse)
+            created_armatures = armature_objs[:-1]
+            combined_armature = armature_objs[-1]
 
             # İlk eleman tam armature olacak şekilde döndür (bind buna yapılacak)
-            return [combined_armature] + created_armatures if combined_armature else created_armatures
+            return [combined_armature] + created_armatures
         
         # TEK ARMATURE OLUŞTUR - Tüm kemikleri tek armature'da tut
         print(f"  Creating single armature with all {len(bones_data)} bones...")
         print(f"  ✓ Skeleton bölünmesi devre dışı - tüm kemikler tek armature'da")
         
         # Deselect all
-        # Deselect all objects safely
-        for obj in bpy.context.scene.objects:
-            obj.select_set(False)
+        deselect_for_armature_edit(context)
         
-        # Create armature
-        bpy.ops.object.armature_add()
-        armature_obj = bpy.context.object
-        armature_obj.name = "ImportedSkeleton"
+        # Create armature (data API: varsayılan kemik yok, operator yükü yok)
+        armature_obj = new_armature_object(context, "ImportedSkeleton", reuse)
         armature_data = armature_obj.data
+        armature_obj.select_set(True)
+        context.view_layer.objects.active = armature_obj
         
         # Enter EDIT mode
         bpy.ops.object.mode_set(mode='EDIT')
+        clear_edit_bones(armature_data)
         
-        # Remove default bone
-        armature_data.edit_bones.remove(armature_data.edit_bones[0])
-        
-        # Build parent-child map and bone index map
-        children_map = {}
-        bone_by_name = {}
-        
-        for idx, bone in enumerate(bones_data):
-            bone['index'] = idx  # Store original index
-            bone_by_name[bone['name']] = bone
-            
-            if bone['parent']:
-                if bone['parent'] not in children_map:
-                    children_map[bone['parent']] = []
-                children_map[bone['parent']].append(bone)
-        
+        # Head/tail konumları tüm kemikler için tek seferde (dizi olarak) hesaplanır
+        heads_bl, tails_bl = bone_rest_pose(bones_data, leaf_length_from_parent=True)
+
         # Create all bones with proper transforms
         bone_map = {}
-        for bone_data in bones_data:
+        for row, bone_data in enumerate(bones_data):
             edit_bone = armature_data.edit_bones.new(bone_data['name'])
-            
-            # Get bone transform data
-            tx, ty, tz = bone_data['translation']
-            qx, qy, qz, qw = bone_data['rotation']
-            
-            # SRO→Blender dönüşümü uygula
-            head_bl = convert_vec_sro_to_blender(Vector((tx, ty, tz)))
-            quat_sro = Quaternion((qw, qx, qy, qz))
-            quat_bl = convert_quat_sro_to_blender(quat_sro)
-            
-            # Set head position (dönüştürülmüş)
-            edit_bone.head = head_bl
-            
-            # Calculate tail position intelligently
-            if bone_data['name'] in children_map:
-                # If has children, point to average of children positions
-                children = children_map[bone_data['name']]
-                if len(children) == 1:
-                    # Point to single child (dönüştürülmüş)
-                    cx, cy, cz = children[0]['translation']
-                    child_pos_bl = convert_vec_sro_to_blender(Vector((cx, cy, cz)))
-                    edit_bone.tail = child_pos_bl
-                else:
-                    # Point to average of children (dönüştürülmüş)
-                    avg_pos = Vector()
-                    for child in children:
-                        cx, cy, cz = child['translation']
-                        child_pos_bl = convert_vec_sro_to_blender(Vector((cx, cy, cz)))
-                        avg_pos += child_pos_bl
-                    avg_pos /= len(children)
-                    edit_bone.tail = avg_pos
-            else:
-                # Leaf bone - use rotation and sensible length
-                bone_length = 5.0  # Default base length
-                
-                # If has parent, use parent's length as reference
-                if bone_data['parent'] and bone_data['parent'] in bone_map:
-                    parent_bone = bone_map[bone_data['parent']]
-                    parent_length = (parent_bone.tail - parent_bone.head).length
-                    bone_length = parent_length * 0.5
-                
-                # Apply rotation to determine tail direction (dönüştürülmüş quaternion kullan)
-                direction = quat_bl.to_matrix() @ Vector((0, bone_length, 0))
-                edit_bone.tail = edit_bone.head + direction
-            
-            # Ensure minimum bone length (Blender requirement)
-            if (edit_bone.tail - edit_bone.head).length < 0.001:
-                edit_bone.tail = edit_bone.head + Vector((0, 0.1, 0))
-            
+            edit_bone.head = heads_bl[row]
+            edit_bone.tail = tails_bl[row]
             bone_map[bone_data['name']] = edit_bone
         
         # Set parent relationships
@@ -496,79 +933,69 @@ class GameImporter(Operator):
         armature_data.show_names = True
         armature_data.show_axes = True
         
-        # Armature already linked by bpy.ops.object.armature_add()
+        # Armature already linked by new_armature_object()
         
         return armature_obj
 
-    def _create_single_armature(self, context, bones_subset):
-        """Create a single armature object from the provided bones subset."""
-        # Ensure stable order: preserve original index order if available
-        ordered = list(bones_subset)
-        ordered.sort(key=lambda b: b.get('index', 0))
-
-        # Deselect all
+    def _create_armature_objects(self, context, bone_subsets, reuse=False):
+        """Create one armature object per bones subset; all bones are built in a single EDIT session."""
         # Deselect all objects safely
-        for obj in bpy.context.scene.objects:
-            obj.select_set(False)
+        deselect_for_armature_edit(context)
 
-        # Create armature
-        bpy.ops.object.armature_add()
-        armature_obj = bpy.context.object
-        armature_obj.name = ordered[0]['name'] if ordered else "ImportedSkeletonPart"
-        armature_data = armature_obj.data
+        # Önce tüm armature objelerini data API ile oluştur
+        created = []
+        for bones_subset in bone_subsets:
+            # Ensure stable order: preserve original index order if available
+            ordered = sorted(bones_subset, key=lambda b: b.get('index', 0))
 
-        # Enter EDIT mode
+            armature_obj = new_armature_object(context, ordered[0]['name'] if ordered else "ImportedSkeletonPart", reuse)
+            created.append((armature_obj, ordered))
+
+        # Hepsini seçip tek seferde (multi-object) EDIT moda gir
+        for armature_obj, _ in created:
+            armature_obj.select_set(True)
+        context.view_layer.objects.active = created[-1][0]
         bpy.ops.object.mode_set(mode='EDIT')
 
-        # Remove default bone
-        if armature_data.edit_bones:
-            armature_data.edit_bones.remove(armature_data.edit_bones[0])
+        for armature_obj, ordered in created:
+            self._build_edit_bones(armature_obj.data, ordered)
 
-        # Build parent-child map
-        children_map = {}
-        for bone in ordered:
-            p = bone.get('parent') or ""
-            if p not in children_map:
-                children_map[p] = []
-            children_map[p].append(bone)
+        # Back to OBJECT mode
+        # Set mode safely
+        if bpy.context.active_object and bpy.context.active_object.type == 'ARMATURE':
+            bpy.ops.object.mode_set(mode='OBJECT')
 
-        # Create all bones
-        bone_map = {}
-        for bone_data in ordered:
-            edit_bone = armature_data.edit_bones.new(bone_data['name'])
+        for armature_obj, _ in created:
+            armature_data = armature_obj.data
 
-            tx, ty, tz = bone_data['translation']
-            qx, qy, qz, qw = bone_data['rotation']
+            # Armature global dönüşümlerini sabitle (mesh ile hizalı başlasın)
+            armature_obj.location = (0.0, 0.0, 0.0)
+            armature_obj.rotation_euler = (0.0, 0.0, 0.0)
+            armature_obj.scale = (1.0, 1.0, 1.0)
 
-            # SRO→Blender dönüşümü uygula
-            head_bl = convert_vec_sro_to_blender(Vector((tx, ty, tz)))
-            quat_sro = Quaternion((qw, qx, qy, qz))
-            quat_bl = convert_quat_sro_to_blender(quat_sro)
+            # Display settings
+            armature_obj.show_in_front = True
+            armature_data.display_type = 'OCTAHEDRAL'
+            armature_data.show_names = True
+            armature_data.show_axes = True
 
-            edit_bone.head = head_bl
+        # Armatures already linked by new_armature_object()
 
-            if bone_data['name'] in children_map and children_map[bone_data['name']]:
-                children = children_map[bone_data['name']]
-                if len(children) == 1:
-                    cx, cy, cz = children[0]['translation']
-                    child_pos_bl = convert_vec_sro_to_blender(Vector((cx, cy, cz)))
-                    edit_bone.tail = child_pos_bl
-                else:
-                    avg_pos = Vector()
-                    for child in children:
-                        cx, cy, cz = child['translation']
-                        child_pos_bl = convert_vec_sro_to_blender(Vector((cx, cy, cz)))
-                        avg_pos += child_pos_bl
-                    avg_pos /= len(children)
-                    edit_bone.tail = avg_pos
-            else:
-                bone_length = 5.0
-                direction = quat_bl.to_matrix() @ Vector((0, bone_length, 0))
-                edit_bone.tail = edit_bone.head + direction
+        return [armature_obj for armature_obj, _ in created]
+
+    def _build_edit_bones(self, armature_data, ordered):
+        """Create edit bones for an armature already in EDIT mode."""
+        clear_edit_bones(armature_data)
 
-            if (edit_bone.tail - edit_bone.head).length < 0.001:
-                edit_bone.tail = edit_bone.head + Vector((0, 0.1, 0))
+        # Head/tail konumları alt kümedeki tüm kemikler için tek seferde hesaplanır
+        heads_bl, tails_bl = bone_rest_pose(ordered)
 
+        # Create all bones
+        bone_map = {}
+        for row, bone_data in enumerate(ordered):
+            edit_bone = armature_data.edit_bones.new(bone_data['name'])
+            edit_bone.head = heads_bl[row]
+            edit_bone.tail = tails_bl[row]
             bone_map[bone_data['name']] = edit_bone
 
         # Parent relationships
@@ -581,132 +1008,110 @@ class GameImporter(Operator):
                 if (bone.head - parent.tail).length < 0.01:
                     bone.use_connect = True
 
-        # Back to OBJECT mode
-        # Set mode safely
-        if bpy.context.active_object and bpy.context.active_object.type == 'ARMATURE':
-            bpy.ops.object.mode_set(mode='OBJECT')
-
-        # Armature global dönüşümlerini sabitle (mesh ile hizalı başlasın)
-        armature_obj.location = (0.0, 0.0, 0.0)
-        armature_obj.rotation_euler = (0.0, 0.0, 0.0)
-        armature_obj.scale = (1.0, 1.0, 1.0)
-
-        # Display settings
-        armature_obj.show_in_front = True
-        armature_data.display_type = 'OCTAHEDRAL'
-        armature_data.show_names = True
-        armature_data.show_axes = True
-
-        # Armature already linked by bpy.ops.object.armature_add()
-
-        return armature_obj
-
-    def import_bms(self, filepath):
+    def import_bms(self, filepath, use_cache=False):
         """Import BMS mesh - FIXED"""
+        import numpy as np
         print(f"\n📦 Importing BMS: {filepath}")
         
+        if use_cache:
+            mesh_data = load_cached_bms(filepath)
+            if mesh_data is not None:
+                print(f"  ✓ {mesh_data['name']}: loaded from parse cache")
+                return mesh_data
+        
         with open(filepath, 'rb') as file:
-            # Signature check
-            sig = file.read(4).decode('utf-8')
-            if not sig.startswith("JMXV"):
-                raise ValueError("Invalid BMS signature")
-            
-            # Version
-            file.read(8)
-            
-            # Header
-            header = struct.unpack('12I', file.read(48))
-            vertex_offset = header[0]
-            face_offset = header[2]
-            
-            # Flags and names
-            file.read(4)  # sub_prim_count
-            vertex_flag = struct.unpack('I', file.read(4))[0]
-            file.read(4)  # unk
-            
-            # Mesh name
-            name_len = struct.unpack('I', file.read(4))[0]
-            name = file.read(name_len).decode('utf-8', errors='replace') if name_len > 0 else "Mesh"
-            
-            # Material name
-            mat_len = struct.unpack('I', file.read(4))[0]
-            mat_name = file.read(mat_len).decode('utf-8', errors='replace') if mat_len > 0 else ""
-            
-            # Read vertices
-            file.seek(vertex_offset)
-            vert_count = struct.unpack('I', file.read(4))[0]
-            
-            verts = []
-            uvs = []
-            skins = []
-            
-            for i in range(vert_count):
-                # Position (SRO -> Blender dönüşümü uygula)
-                pos = struct.unpack('3f', file.read(12))
-                p_bl = convert_vec_sro_to_blender(Vector(pos))
-                verts.append((p_bl.x, p_bl.y, p_bl.z))
-                
-                # Normal (skip)
-                file.read(12)
-                
-                # UV
-                uv = struct.unpack('2f', file.read(8))
-                uvs.append((uv[0], 1.0 - uv[1]))  # Flip V
-                
-                # Skip float
-                file.read(4)
-                
-                # Skin data
-                indices = struct.unpack('4B', file.read(4))
-                weights_raw = struct.unpack('4B', file.read(4))
-                total = sum(weights_raw)
-                weights = [w / total for w in weights_raw] if total > 0 else [0.0] * 4
-                skins.append({'indices': indices, 'weights': weights})
-                
-                # Additional data based on flags
-                if vertex_flag & 0x400:
-                    file.read(8)  # uv1
-                if vertex_flag & 0x800:
-                    file.read(32)  # morph
-            
-            # Read faces
-            file.seek(face_offset)
-            face_count = struct.unpack('I', file.read(4))[0]
-            
-            faces = []
-            for i in range(face_count):
-                face = struct.unpack('3H', file.read(6))
-                faces.append(face)
-            
-            print(f"  ✓ {name}: {vert_count} verts, {face_count} faces")
-            
-            # Material assignment info
-            if mat_name:
-                print(f"    → Material: '{mat_name}'")
-            
-            return {
-                'name': name,
-                'vertices': verts,
-                'faces': faces,
-                'uvs': uvs,
-                'skin_data': skins,
-                'material_name': mat_name
-            }
-
-    def create_mesh_object(self, context, mesh_data):
+            data = memoryview(file.read())
+        
+        # Signature check
+        sig = str(data[0:4], 'utf-8')
+        if not sig.startswith("JMXV"):
+            raise ValueError("Invalid BMS signature")
+        
+        # Version (8 byte) atlanır
+        off = 12
+        
+        # Header
+        header = _S_BMS_HEADER.unpack_from(data, off)
+        off += 48
+        vertex_offset = header[0]
+        face_offset = header[2]
+        
+        # Flags and names
+        off += 4  # sub_prim_count
+        vertex_flag = _S_U32.unpack_from(data, off)[0]
+        off += 8  # vertex_flag + unk
+        
+        # Mesh name
+        name_len = _S_U32.unpack_from(data, off)[0]
+        off += 4
+        name = str(data[off:off + name_len], 'utf-8', 'replace') if name_len > 0 else "Mesh"
+        off += name_len
+        
+        # Material name
+        mat_len = _S_U32.unpack_from(data, off)[0]
+        off += 4
+        mat_name = str(data[off:off + mat_len], 'utf-8', 'replace') if mat_len > 0 else ""
+        
+        # Read vertices
+        off = vertex_offset
+        vert_count = _S_U32.unpack_from(data, off)[0]
+        off += 4
+        
+        records = np.frombuffer(data, dtype=bms_vertex_dtype(vertex_flag), count=vert_count, offset=off)
+        
+        # Position: dosya görünümünden doğrudan Blender uzayında float32 diziye (normal'ler kullanılmıyor, okunmaz)
+        # (parser çıktısı zaten Blender koordinatlarındadır, sonradan dönüşüm gerekmez)
+        verts = convert_vecs_sro_to_blender(records['pos'], np.float32)
+        
+        # UV (Flip V)
+        uvs = records['uv'].astype(np.float32)
+        uvs[:, 1] = 1.0 - uvs[:, 1]
+        
+        # Skin data (ağırlıklar vertex başına normalize edilir)
+        bone_ids = records['idx'].copy()
+        weights_raw = records['w'].astype(np.float32)
+        weights_raw[bone_ids == 0xFF] = 0.0  # boş slotlar toplama katılmasın (Σw = 1 gerçek kemiklerde)
+        totals = weights_raw.sum(axis=1, keepdims=True)
+        weights = np.divide(weights_raw, totals, out=np.zeros_like(weights_raw), where=totals > 0)
+
+        # Read faces
+        off = face_offset
+        face_count = _S_U32.unpack_from(data, off)[0]
+        off += 4
+        faces = np.frombuffer(data, dtype='<u2', count=3 * face_count, offset=off).reshape(-1, 3).astype(np.uint32)
+        
+        print(f"  ✓ {name}: {vert_count} verts, {face_count} faces")
+        
+        # Material assignment info
+        if mat_name:
+            print(f"    → Material: '{mat_name}'")
+        
+        # Vertex verisi SoA: her öznitelik ayrı bir NumPy dizisi (N satır)
+        mesh_data = {
+            'name': name,
+            'co': verts,
+            'uv': uvs,
+            'bone_ids': bone_ids,
+            'weights': weights,
+            'faces': faces,
+            'material_name': mat_name
+        }
+        if use_cache:
+            save_cached_bms(filepath, mesh_data)
+        return mesh_data
+
+    def create_mesh_object(self, context, mesh_data, reuse=False):
         """Create mesh object - FIXED"""
-        mesh = bpy.data.meshes.new(mesh_data['name'])
-        mesh.from_pydata(mesh_data['vertices'], [], mesh_data['faces'])
+        mesh = reuse_or_new_mesh(mesh_data['name'], reuse)
+        fill_mesh_geometry(mesh, mesh_data['co'], mesh_data['faces'])
         
         # Add UVs
-        if mesh_data.get('uvs'):
-            uv_layer = mesh.uv_layers.new(name="UVMap")
-            for i, loop in enumerate(mesh.loops):
-                uv_layer.data[i].uv = mesh_data['uvs'][loop.vertex_index]
+        if len(mesh_data.get('uv', ())):
+            fill_mesh_uvs(mesh, mesh_data['uv'], mesh_data['faces'])
         
-        mesh.update()
+        mesh.update(calc_edges=True)
         
-        obj = bpy.data.objects.new(mesh_data['name'], mesh)
+        obj = reuse_or_new_object(mesh_data['name'], mesh, reuse)
         context.collection.objects.link(obj)
         # Mesh ve skeleton aynı konumda başlasın - rotasyon yok
         obj.location = (0.0, 0.0, 0.0)
@@ -719,176 +1124,60 @@ class GameImporter(Operator):
         
         return obj
 
-    def create_combined_mesh(self, context, mesh_data_list, name):
+    def create_combined_mesh(self, context, mesh_data_list, name, reuse=False):
         """Create combined mesh - FIXED"""
-        all_verts = []
-        all_faces = []
-        all_uvs = []
-        all_skins = []
-        v_offset = 0
-        
-        for data in mesh_data_list:
-            all_verts.extend(data['vertices'])
-            if data.get('uvs'):
-                all_uvs.extend(data['uvs'])
-            if data.get('skin_data'):
-                all_skins.extend(data['skin_data'])
-            
-            for face in data['faces']:
-                all_faces.append(tuple(i + v_offset for i in face))
-            
-            v_offset += len(data['vertices'])
+        import numpy as np
+        # Her mesh'in vertex offset'i tek cumsum ile; yüzler offset eklenerek birleştirilir
+        offsets = np.cumsum([0] + [len(data['co']) for data in mesh_data_list[:-1]])
+        all_faces = np.concatenate([data['faces'] + np.uint32(o) for data, o in zip(mesh_data_list, offsets)])
+        all_verts = np.concatenate([data['co'] for data in mesh_data_list])
+        all_uvs = np.concatenate([data['uv'] for data in mesh_data_list])
+        all_bone_ids = np.concatenate([data['bone_ids'] for data in mesh_data_list])
         
-        mesh = bpy.data.meshes.new(name)
-        mesh.from_pydata(all_verts, [], all_faces)
+        mesh = reuse_or_new_mesh(name, reuse)
+        fill_mesh_geometry(mesh, all_verts, all_faces)
         
         # Add UVs
-        if all_uvs:
-            uv_layer = mesh.uv_layers.new(name="UVMap")
-            for i, loop in enumerate(mesh.loops):
-                uv_layer.data[i].uv = all_uvs[loop.vertex_index]
+        if len(all_uvs):
+            fill_mesh_uvs(mesh, all_uvs, all_faces)
         
-        mesh.update()
+        mesh.update(calc_edges=True)
         
-        obj = bpy.data.objects.new(name, mesh)
+        obj = reuse_or_new_object(name, mesh, reuse)
         context.collection.objects.link(obj)
         # Mesh ve skeleton aynı konumda başlasın - rotasyon yok
         obj.location = (0.0, 0.0, 0.0)
         obj.rotation_euler = (0.0, 0.0, 0.0)
         obj.scale = (1.0, 1.0, 1.0)
         
-        # Store skin data for later binding
-        obj['combined_skin_data'] = all_skins
-        obj['mesh_data_list'] = mesh_data_list
-        
         # Combined mesh için vertex group'ları oluştur (Auto Weights başarısız olursa)
-        if all_skins:
+        if len(all_bone_ids):
             # Tüm kemik isimlerini topla
-            bone_names = set()
-            for skin in all_skins:
-                for bone_idx in skin['indices']:
-                    if bone_idx != 255 and bone_idx != 0xFF:
-                        bone_names.add(f"Bone_{bone_idx}")  # Geçici isim
+            bone_names = {f"Bone_{bone_idx}" for bone_idx in np.unique(all_bone_ids).tolist()
+                          if bone_idx != 0xFF}  # Geçici isim
             
             # Vertex group'ları oluştur
-            for bone_name in bone_names:
-                if bone_name not in obj.vertex_groups:
-                    obj.vertex_groups.new(name=bone_name)
+            ensure_vertex_groups(obj, sorted(bone_names))
             
-            print(f"  DEBUG: Combined mesh için {len(bone_names)} vertex group oluşturuldu")
+            if VERBOSE_DEBUG:
+                print(f"  DEBUG: Combined mesh için {len(bone_names)} vertex group oluşturuldu")
         
         return obj
 
     def fit_armature_to_mesh(self, armature_obj, mesh_objects):
         """Fit armature to mesh - Scale and position armature to match mesh"""
-        print(f"\n🔧 Fitting armature to mesh...")
-        
-        # Calculate combined mesh bounding box (in local space)
-        min_bound = Vector((float('inf'), float('inf'), float('inf')))
-        max_bound = Vector((float('-inf'), float('-inf'), float('-inf')))
-        
-        for mesh_obj in mesh_objects:
-            for vert in mesh_obj.data.vertices:
-                # Use local coordinates since both mesh and armature are at 0,0,0
-                min_bound.x = min(min_bound.x, vert.co.x)
-                min_bound.y = min(min_bound.y, vert.co.y)
-                min_bound.z = min(min_bound.z, vert.co.z)
-                max_bound.x = max(max_bound.x, vert.co.x)
-                max_bound.y = max(max_bound.y, vert.co.y)
-                max_bound.z = max(max_bound.z, vert.co.z)
-        
-        mesh_size = max_bound - min_bound
-        mesh_center = (min_bound + max_bound) / 2
-        
-        print(f"  Mesh bounds: {min_bound} to {max_bound}")
-        print(f"  Mesh size: {mesh_size}")
-        print(f"  Mesh center: {mesh_center}")
-        
-        # Calculate armature bounding box
-        # Deselect all objects safely
-        for obj in bpy.context.scene.objects:
-            obj.select_set(False)
-        
-        armature_obj.select_set(True)
-        bpy.context.view_layer.objects.active = armature_obj
-        # Set mode safely
-        if bpy.context.active_object and bpy.context.active_object.type == 'ARMATURE':
-            bpy.ops.object.mode_set(mode='EDIT')
-        
-        arm_min = Vector((float('inf'), float('inf'), float('inf')))
-        arm_max = Vector((float('-inf'), float('-inf'), float('-inf')))
-        
-        for bone in armature_obj.data.edit_bones:
-            for point in [bone.head, bone.tail]:
-                # Use local coordinates (armature at 1/1/1 scale)
-                arm_min.x = min(arm_min.x, point.x)
-                arm_min.y = min(arm_min.y, point.y)
-                arm_min.z = min(arm_min.z, point.z)
-                arm_max.x = max(arm_max.x, point.x)
-                arm_max.y = max(arm_max.y, point.y)
-                arm_max.z = max(arm_max.z, point.z)
-        
-        # Set mode safely
-        if bpy.context.active_object and bpy.context.active_object.type == 'ARMATURE':
-            bpy.ops.object.mode_set(mode='OBJECT')
-        
-        arm_size = arm_max - arm_min
-        arm_center = (arm_min + arm_max) / 2
-        
-        print(f"  Armature bounds: {arm_min} to {arm_max}")
-        print(f"  Armature size: {arm_size}")
-        print(f"  Armature center: {arm_center}")
-        
-        # Calculate scale factor (make armature match mesh size)
-        # Use largest dimension to maintain proportions
-        mesh_max_dim = max(mesh_size.x, mesh_size.y, mesh_size.z)
-        arm_max_dim = max(arm_size.x, arm_size.y, arm_size.z)
-        
-        if arm_max_dim > 0.001 and mesh_max_dim > 0.001:
-            scale_factor = mesh_max_dim / arm_max_dim
-            
-            # Apply scale to armature
-            armature_obj.scale = (scale_factor, scale_factor, scale_factor)
-            # Apply scale (prevent animation-time double transform)
-            # Deselect all, select armature and apply scale only
-            for obj in bpy.context.scene.objects:
-                obj.select_set(False)
-            armature_obj.select_set(True)
-            bpy.context.view_layer.objects.active = armature_obj
-            try:
-                bpy.ops.object.transform_apply(location=False, rotation=False, scale=True)
-            except Exception:
-                pass
-            
-            # Merkez hizalama - her iki obje de 0,0,0'da olduğu için offset hesapla
-            offset = mesh_center - (arm_center * scale_factor)
-            armature_obj.location = offset
-            
-            print(f"  ✓ Scale factor: {scale_factor:.4f}")
-            print(f"  ✓ Location offset: {offset}")
-        else:
-            print(f"  ⚠️ Cannot calculate scale factor, keeping original sizes")
+        self.fit_all_armatures_to_mesh([armature_obj], mesh_objects)
     
     def fit_all_armatures_to_mesh(self, armature_objects, mesh_objects):
         """Fit all armatures to mesh - Scale and position armatures to match mesh"""
         if not armature_objects or not mesh_objects:
             return
             
-        print(f"\n🔧 Fitting {len(armature_objects)} armatures to mesh...")
+        print(f"\n🔧 Fitting {len(armature_objects)} armature(s) to mesh...")
         
         # Calculate mesh bounding box once (in local space)
-        min_bound = Vector((float('inf'), float('inf'), float('inf')))
-        max_bound = Vector((float('-inf'), float('-inf'), float('-inf')))
-        
-        for mesh_obj in mesh_objects:
-            for vert in mesh_obj.data.vertices:
-                # Use local coordinates since both mesh and armature are at 0,0,0
-                min_bound.x = min(min_bound.x, vert.co.x)
-                min_bound.y = min(min_bound.y, vert.co.y)
-                min_bound.z = min(min_bound.z, vert.co.z)
-                max_bound.x = max(max_bound.x, vert.co.x)
-                max_bound.y = max(max_bound.y, vert.co.y)
-                max_bound.z = max(max_bound.z, vert.co.z)
+        # Use local coordinates since both mesh and armature are at 0,0,0
+        min_bound, max_bound = mesh_vertex_bounds(mesh_objects)
         
         mesh_size = max_bound - min_bound
         mesh_center = (min_bound + max_bound) / 2
@@ -899,53 +1188,33 @@ class GameImporter(Operator):
         print(f"  Mesh center: {mesh_center}")
         
         # Calculate scale factor from first armature, then apply to all
+        # Rest pozisyonları OBJECT modda bones.head_local/tail_local'dan okunur (EDIT moda gerek yok)
         first_arm = armature_objects[0]
-        # Deselect all objects safely
-        for obj in bpy.context.scene.objects:
-            obj.select_set(False)
-        first_arm.select_set(True)
-        bpy.context.view_layer.objects.active = first_arm
-        # Set mode safely
-        if bpy.context.active_object and bpy.context.active_object.type == 'ARMATURE':
-            bpy.ops.object.mode_set(mode='EDIT')
-        
-        arm_min = Vector((float('inf'), float('inf'), float('inf')))
-        arm_max = Vector((float('-inf'), float('-inf'), float('-inf')))
-        
-        for bone in first_arm.data.edit_bones:
-            for point in [bone.head, bone.tail]:
-                # Use local coordinates (armature at 1/1/1 scale)
-                arm_min.x = min(arm_min.x, point.x)
-                arm_min.y = min(arm_min.y, point.y)
-                arm_min.z = min(arm_min.z, point.z)
-                arm_max.x = max(arm_max.x, point.x)
-                arm_max.y = max(arm_max.y, point.y)
-                arm_max.z = max(arm_max.z, point.z)
-        
-        # Set mode safely
-        if bpy.context.active_object and bpy.context.active_object.type == 'ARMATURE':
-            bpy.ops.object.mode_set(mode='OBJECT')
+        arm_min, arm_max = armature_rest_bounds(first_arm)
         
         arm_size = arm_max - arm_min
         arm_center = (arm_min + arm_max) / 2
         arm_max_dim = max(arm_size.x, arm_size.y, arm_size.z)
         
+        print(f"  Armature bounds: {arm_min} to {arm_max}")
+        print(f"  Armature size: {arm_size}")
+        print(f"  Armature center: {arm_center}")
+        
         # Calculate scale factor (make armature match mesh size)
+        # Use largest dimension to maintain proportions
         if arm_max_dim > 0.001 and mesh_max_dim > 0.001:
             scale_factor = mesh_max_dim / arm_max_dim
             
             # Apply same scale and offset to all armatures
+            # Ölçek doğrudan armature verisine uygulanır (transform_apply operatörü yerine);
+            # obje ölçeği 1 kalır, animasyonda çift dönüşüm olmaz
+            if bpy.context.object and bpy.context.object.mode != 'OBJECT':
+                bpy.ops.object.mode_set(mode='OBJECT')
+            scale_matrix = Matrix.Scale(scale_factor, 4)
             for i, arm in enumerate(armature_objects):
-                arm.scale = (scale_factor, scale_factor, scale_factor)
-                # Apply scale to each armature to avoid double transform at animation time
-                for obj in bpy.context.scene.objects:
-                    obj.select_set(False)
-                arm.select_set(True)
-                bpy.context.view_layer.objects.active = arm
-                try:
-                    bpy.ops.object.transform_apply(location=False, rotation=False, scale=True)
-                except Exception:
-                    pass
+                arm.data.transform(scale_matrix)
+                arm.scale = (1.0, 1.0, 1.0)
+                # Merkez hizalama - her iki obje de 0,0,0'da olduğu için offset hesapla
                 offset = mesh_center - (arm_center * scale_factor)
                 arm.location = offset
                 print(f"  ✓ Armature {i+1} ({arm.name}): scale={scale_factor:.4f}, offset={offset}")
@@ -955,34 +1224,28 @@ class GameImporter(Operator):
         else:
             print(f"  ⚠️ Cannot calculate scale factor, keeping original sizes")
     
-    def bind_to_skeleton(self, mesh_obj, armature_obj, mesh_data_list):
+    def bind_to_skeleton(self, mesh_obj, armature_obj, mesh_data_list, quant_bits=0):
         """Bind mesh to skeleton - FIXED with proper bone indexing"""
+        import numpy as np
         print(f"\n🔗 Binding {mesh_obj.name} to {armature_obj.name}")
         
         # Helper: run an operator with a safe VIEW_3D override
+        # (window/area/region bu bind için ilk çağrıda bir kez çözülür; hata olursa yeniden aranır)
+        view3d_cache = []
         def run_with_view3d_override(op_callable, **kwargs):
             try:
-                win = bpy.context.window
-                scr = win.screen if win else None
-                area = None
-                region = None
-                if scr:
-                    for a in scr.areas:
-                        if a.type == 'VIEW_3D':
-                            area = a
-                            break
-                    if area:
-                        for r in area.regions:
-                            if r.type == 'WINDOW':
-                                region = r
-                                break
-                if area and region and win:
+                if not view3d_cache:
+                    view3d_cache.append(find_view3d_region(bpy.context))
+                handles = view3d_cache[0]
+                if handles:
+                    win, scr, area, region = handles
                     with bpy.context.temp_override(window=win, screen=scr, area=area, region=region, view_layer=bpy.context.view_layer, scene=bpy.context.scene, object=mesh_obj):
                         return op_callable(**kwargs)
                 else:
                     return op_callable(**kwargs)
             except Exception as e:
                 print(f"  DEBUG: run_with_view3d_override failed: {e}")
+                view3d_cache.clear()
                 try:
                     return op_callable(**kwargs)
                 except Exception as e2:
@@ -998,25 +1261,14 @@ class GameImporter(Operator):
                 return
         
         # DEBUG: Check bone count and names
-        bone_count = len(armature_obj.data.bones)
-        bone_names = [bone.name for bone in armature_obj.data.bones]
-        print(f"  DEBUG: Armature has {bone_count} bones")
-        print(f"  DEBUG: Bone index range: 0-{bone_count-1}")
-        print(f"  DEBUG: Bone names: {bone_names[:10]}...")  # Show first 10
-        print(f"  DEBUG: All bone names: {bone_names}")  # Show ALL bone names
-        
-        # Create bone name to index mapping for fallback
-        bone_name_to_index = {name: i for i, name in enumerate(bone_names)}
-        
-        # Create smart bone mapping for high indices
-        # Group bones by type for better mapping
-        spine_bones = [i for i, name in enumerate(bone_names) if 'Spine' in name or 'Neck' in name or 'Head' in name]
-        arm_bones = [i for i, name in enumerate(bone_names) if 'Arm' in name or 'Hand' in name or 'Finger' in name or 'Clavicle' in name]
-        leg_bones = [i for i, name in enumerate(bone_names) if 'Thigh' in name or 'Calf' in name or 'Foot' in name or 'Toe' in name or 'HorseLink' in name]
-        tail_bones = [i for i, name in enumerate(bone_names) if 'Tail' in name or 'Ponytail' in name]
-        other_bones = [i for i, name in enumerate(bone_names) if name.startswith('Bone')]
-        
-        print(f"  DEBUG: Bone groups - Spine: {len(spine_bones)}, Arm: {len(arm_bones)}, Leg: {len(leg_bones)}, Tail: {len(tail_bones)}, Other: {len(other_bones)}")
+        bone_names, (spine_bones, arm_bones, leg_bones, tail_bones, other_bones) = bone_lookup(armature_obj)
+        bone_count = len(bone_names)
+        if VERBOSE_DEBUG:
+            print(f"  DEBUG: Armature has {bone_count} bones")
+            print(f"  DEBUG: Bone index range: 0-{bone_count-1}")
+            print(f"  DEBUG: Bone names: {bone_names[:10]}...")  # Show first 10
+            print(f"  DEBUG: All bone names: {bone_names}")  # Show ALL bone names
+            print(f"  DEBUG: Bone groups - Spine: {len(spine_bones)}, Arm: {len(arm_bones)}, Leg: {len(leg_bones)}, Tail: {len(tail_bones)}, Other: {len(other_bones)}")
         
         # Parent KALDIRILDI: Split çoklu armature senaryosunda tek bir armature'a
         # parent etmek global dönüşlerde çakışma yaratabiliyor. Sadece modifier kullan.
@@ -1025,121 +1277,102 @@ class GameImporter(Operator):
         mod = mesh_obj.modifiers.new(name="Armature", type='ARMATURE')
         mod.object = armature_obj
         mod.use_deform_preserve_volume = True  # Better deformation
-        print(f"  DEBUG: Armature modifier added: {mod.name}")
+        if VERBOSE_DEBUG:
+            print(f"  DEBUG: Armature modifier added: {mod.name}")
 
         # Mesh zaten 0,0,0'da ve rotasyon yok, transform uygulamaya gerek yok
         
-        # Create vertex groups for all bones
-        for bone in armature_obj.data.bones:
-            if bone.name not in mesh_obj.vertex_groups:
-                mesh_obj.vertex_groups.new(name=bone.name)
-        
-        # Create bone name to local index mapping
-        bone_name_to_local_index = {}
-        for i, bone in enumerate(armature_obj.data.bones):
-            bone_name_to_local_index[bone.name] = i
+        # Create vertex groups for all bones (kemik index'i → vertex group, bir kez çözülür)
+        vg_map = ensure_vertex_groups(mesh_obj, bone_names)
+        vg_by_bone_idx = [vg_map[name] for name in bone_names]
         
         # Apply skin weights - with proper bone index handling
-        v_offset = 0
-        total_weights = 0
         successful_weights = 0
         failed_bones = set()
-        out_of_range_count = 0
-        skipped_empty = 0
-        
-        for data in mesh_data_list:
-            skin_data = data.get('skin_data')
-            if not skin_data:
-                v_offset += len(data['vertices'])
-                continue
-            
-            # DEBUG: Analyze skin data to understand bone index range
-            all_bone_indices = set()
-            for skin in skin_data:
-                for bone_idx in skin['indices']:
-                    if bone_idx != 255 and bone_idx != 0xFF:
-                        all_bone_indices.add(bone_idx)
-            
-            if all_bone_indices:
-                print(f"  DEBUG: {data.get('name', 'Unknown')} skin data contains bone indices: {sorted(all_bone_indices)}")
-                print(f"  DEBUG: Min bone index: {min(all_bone_indices)}")
-                print(f"  DEBUG: Max bone index: {max(all_bone_indices)}")
-            
-            for v_idx, skin in enumerate(skin_data):
-                for i in range(4):
-                    bone_idx = skin['indices'][i]
-                    weight = skin['weights'][i]
-                    
-                    # Skip empty slots (0xFF = 255)
-                    if bone_idx == 255 or bone_idx == 0xFF:
-                        if weight > 0:
-                            skipped_empty += 1
-                        continue
-                    
-                    # Skip zero weights
-                    if weight <= 0.001:
-                        continue
-                    
-                    total_weights += 1
-                    
-                    # Bone index mapping with fallback
-                    try:
-                        if bone_idx < len(armature_obj.data.bones):
-                            # Direct mapping
-                            bone_name = armature_obj.data.bones[bone_idx].name
-                            vg = mesh_obj.vertex_groups.get(bone_name)
-                            if vg:
-                                vg.add([v_idx + v_offset], weight, 'ADD')
-                                successful_weights += 1
-                            else:
-                                failed_bones.add(bone_idx)
-                        else:
-                            out_of_range_count += 1
-                            # Index out of range - try smart mapping based on bone type
-                            # Map high indices to similar bone types
-                            if bone_idx >= 77:
-                                # High indices: map to appropriate bone group
-                                offset = bone_idx - 77
-                                
-                                # Try to map to spine bones first (most common)
-                                if spine_bones and offset < len(spine_bones):
-                                    mapped_idx = spine_bones[offset % len(spine_bones)]
-                                elif arm_bones and offset < len(arm_bones) * 2:
-                                    mapped_idx = arm_bones[(offset - len(spine_bones)) % len(arm_bones)]
-                                elif leg_bones and offset < len(leg_bones) * 2:
-                                    mapped_idx = leg_bones[(offset - len(spine_bones) - len(arm_bones)) % len(leg_bones)]
-                                elif other_bones:
-                                    mapped_idx = other_bones[offset % len(other_bones)]
-                                else:
-                                    # Fallback: use modulo mapping
-                                    mapped_idx = (bone_idx - 77) % (len(armature_obj.data.bones) - 1) + 1
-                            else:
-                                # Very high indices: use modulo mapping
-                                mapped_idx = bone_idx % len(armature_obj.data.bones)
-                            
-                            bone_name = armature_obj.data.bones[mapped_idx].name
-                            
-                            vg = mesh_obj.vertex_groups.get(bone_name)
-                            if vg:
-                                vg.add([v_idx + v_offset], weight, 'ADD')
-                                successful_weights += 1
-                                if bone_idx not in failed_bones:  # Only print once per unique index
-                                    print(f"  DEBUG: Bone index {bone_idx} mapped to {mapped_idx} ({bone_name})")
-                            else:
-                                failed_bones.add(bone_idx)
-                    except (IndexError, KeyError) as e:
-                        print(f"  DEBUG: Exception for bone_idx {bone_idx}: {e}")
-                        failed_bones.add(bone_idx)
+        bone_total = len(bone_names)
+        
+        def map_out_of_range(bone_idx):
+            # Index out of range - try smart mapping based on bone type
+            # Map high indices to similar bone types
+            if bone_idx >= 77:
+                # High indices: map to appropriate bone group
+                offset = bone_idx - 77
+                
+                # Try to map to spine bones first (most common)
+                if spine_bones and offset < len(spine_bones):
+                    return spine_bones[offset % len(spine_bones)]
+                elif arm_bones and offset < len(arm_bones) * 2:
+                    return arm_bones[(offset - len(spine_bones)) % len(arm_bones)]
+                elif leg_bones and offset < len(leg_bones) * 2:
+                    return leg_bones[(offset - len(spine_bones) - len(arm_bones)) % len(leg_bones)]
+                elif other_bones:
+                    return other_bones[offset % len(other_bones)]
+                # Fallback: use modulo mapping
+                return (bone_idx - 77) % (bone_total - 1) + 1
+            # Very high indices: use modulo mapping
+            return bone_idx % bone_total
+        
+        # Kemik adı → (vertex index'leri, ağırlıklar) parçaları; sonunda kemik başına toplu yazılır
+        pending = {}
+        
+        # DEBUG: Analyze skin data to understand bone index range
+        if VERBOSE_DEBUG:
+            for data in mesh_data_list:
+                all_bone_indices = [i for i in np.unique(data['bone_ids']).tolist() if i != 0xFF]
+                if all_bone_indices:
+                    print(f"  DEBUG: {data.get('name', 'Unknown')} skin data contains bone indices: {all_bone_indices}")
+                    print(f"  DEBUG: Min bone index: {all_bone_indices[0]}")
+                    print(f"  DEBUG: Max bone index: {all_bone_indices[-1]}")
+        
+        # Tüm mesh'lerin skin dizileri tek (N, 4) diziye birleştirilir; satır = global vertex index
+        bone_ids = np.concatenate([data['bone_ids'] for data in mesh_data_list]).astype(np.int64)
+        weights = np.concatenate([data['weights'] for data in mesh_data_list])
+        
+        # Skip empty slots (0xFF = 255) and zero weights
+        empty = bone_ids == 0xFF
+        # Boş slotların ağırlığı import_bms'te sıfırlanır; burada yalnızca slot sayısı raporlanır
+        skipped_empty = int(np.count_nonzero(empty))
+        rows, slots = np.nonzero(~empty & (weights > 0.001))
+        slot_bones = bone_ids[rows, slots]
+        slot_weights = weights[rows, slots]
+        total_weights = len(slot_bones)
+        out_of_range_count = int(np.count_nonzero(slot_bones >= bone_total))
+        
+        for bone_idx in np.unique(slot_bones).tolist():
+            sel = slot_bones == bone_idx
+            count = int(np.count_nonzero(sel))
             
-            v_offset += len(data['vertices'])
+            # Bone index mapping with fallback
+            try:
+                # Direct mapping, index out of range ise kemik tipine göre eşle
+                mapped_idx = bone_idx if bone_idx < bone_total else map_out_of_range(bone_idx)
+                
+                vg = vg_by_bone_idx[mapped_idx]
+                if vg:
+                    pending.setdefault(mapped_idx, []).append((rows[sel], slot_weights[sel]))
+                    successful_weights += count
+                    if VERBOSE_DEBUG and mapped_idx != bone_idx:
+                        print(f"  DEBUG: Bone index {bone_idx} mapped to {mapped_idx} ({bone_names[mapped_idx]})")
+                else:
+                    failed_bones.add(bone_idx)
+            except (IndexError, KeyError) as e:
+                print(f"  DEBUG: Exception for bone_idx {bone_idx}: {e}")
+                failed_bones.add(bone_idx)
+        
+        for mapped_idx, parts in pending.items():
+            add_vertex_group_weights(vg_by_bone_idx[mapped_idx],
+                                     np.concatenate([p[0] for p in parts]),
+                                     np.concatenate([p[1] for p in parts]),
+                                     quant_bits)
         
         # Sonuç raporu
-        print(f"  DEBUG: Total processed weights: {total_weights}")
-        print(f"  DEBUG: Successful weights: {successful_weights}")
-        print(f"  DEBUG: Failed bones: {len(failed_bones)}")
-        print(f"  DEBUG: Skipped empty slots: {skipped_empty}")
+        if VERBOSE_DEBUG:
+            print(f"  DEBUG: Total processed weights: {total_weights}")
+            print(f"  DEBUG: Successful weights: {successful_weights}")
+            print(f"  DEBUG: Failed bones: {len(failed_bones)}")
+            print(f"  DEBUG: Skipped empty slots: {skipped_empty}")
         out_of_range_ratio = (out_of_range_count / max(1, total_weights)) if total_weights > 0 else 0.0
-        if out_of_range_count:
+        if VERBOSE_DEBUG and out_of_range_count:
             print(f"  DEBUG: Out-of-range indices: {out_of_range_count} (ratio={out_of_range_ratio:.2f})")
         
         if failed_bones:
@@ -1149,10 +1382,10 @@ class GameImporter(Operator):
             print(f"  ⚠️  {failed_count} geçersiz bone index: {failed_list}")
             print(f"  ✓ Binding: {successful_weights}/{total_weights} weight (%{success_rate:.1f})")
         
-        if skipped_empty > 0:
+        if VERBOSE_DEBUG and skipped_empty > 0:
             print(f"  ℹ️  {skipped_empty} boş slot atlandı (0xFF)")
         
-        if not failed_bones and skipped_empty == 0:
+        if not failed_bones:
             print(f"  ✓ Binding complete: {successful_weights} weights applied")
 
         # Güvenli fallback: Aşırı oranda out-of-range varsa otomatik ağırlık kullan
@@ -1163,18 +1396,16 @@ class GameImporter(Operator):
                 mesh_obj.vertex_groups.clear()
                 # Armature'u OBJECT moda al ve poz dönüşümlerini temizle
                 bpy.context.view_layer.objects.active = armature_obj
-                try:
-                    if bpy.context.object and bpy.context.object.mode != 'OBJECT':
-                        bpy.ops.object.mode_set(mode='OBJECT')
-                    bpy.ops.object.mode_set(mode='POSE')
-                    bpy.ops.pose.select_all(action='SELECT')
-                    bpy.ops.pose.rot_clear()
-                    bpy.ops.pose.loc_clear()
-                    bpy.ops.pose.scale_clear()
-                except Exception:
-                    pass
                 if bpy.context.object and bpy.context.object.mode != 'OBJECT':
                     bpy.ops.object.mode_set(mode='OBJECT')
+                # Poz sıfırlama doğrudan veri yazımıyla (POSE modu ve rot/loc/scale_clear operatörleri yok)
+                pose_bones = armature_obj.pose.bones
+                n_pb = len(pose_bones)
+                pose_bones.foreach_set("location", np.zeros(n_pb * 3, dtype=np.float32))
+                pose_bones.foreach_set("rotation_euler", np.zeros(n_pb * 3, dtype=np.float32))
+                pose_bones.foreach_set("rotation_quaternion", np.tile(np.array((1, 0, 0, 0), dtype=np.float32), n_pb))
+                pose_bones.foreach_set("rotation_axis_angle", np.tile(np.array((0, 0, 1, 0), dtype=np.float32), n_pb))
+                pose_bones.foreach_set("scale", np.ones(n_pb * 3, dtype=np.float32))
                 # Armature veri bloğunu Pose pozisyonuna zorla
                 try:
                     armature_obj.data.pose_position = 'POSE'
@@ -1182,11 +1413,7 @@ class GameImporter(Operator):
                     pass
 
                 # Seçimleri ayarla
-                for obj in bpy.context.scene.objects:
-                    obj.select_set(False)
-                armature_obj.select_set(True)
-                mesh_obj.select_set(True)
-                bpy.context.view_layer.objects.active = mesh_obj
+                select_only(bpy.context, mesh_obj, armature_obj)
                 # Otomatik ağırlık ile parent-set (modifier ve parent gelir) - güvenli override ile
                 run_with_view3d_override(bpy.ops.object.parent_set, type='ARMATURE_AUTO')
                 # Ebeveynliği kaldır, sadece modifier kalsın
@@ -1209,46 +1436,23 @@ class GameImporter(Operator):
                 keep.use_deform_preserve_volume = True
                 keep.use_vertex_groups = True
                 keep.use_bone_envelopes = False
-                # Modifier'ı en üste güvenli taşı (sonsuz döngü önleme ve doğru context)
-                try:
-                    # OBJECT moda ve aktif obje mesh olsun
-                    for obj in bpy.context.scene.objects:
-                        obj.select_set(False)
-                    mesh_obj.select_set(True)
-                    bpy.context.view_layer.objects.active = mesh_obj
-                    if bpy.context.object and bpy.context.object.mode != 'OBJECT':
-                        bpy.ops.object.mode_set(mode='OBJECT')
-
-                    def get_index():
-                        for i, m in enumerate(mesh_obj.modifiers):
-                            if m is keep:
-                                return i
-                        return -1
-
-                    max_attempts = len(mesh_obj.modifiers) + 2
-                    attempts = 0
-                    last_index = get_index()
-                    while get_index() > 0 and attempts < max_attempts:
+                # Modifier'ı en üste taşı: tek data-API çağrısı (Blender 3.5+), eskilerde operatör
+                idx = next(i for i, m in enumerate(mesh_obj.modifiers) if m == keep)
+                if idx > 0:
+                    try:
+                        mesh_obj.modifiers.move(idx, 0)
+                    except AttributeError:
                         try:
-                            bpy.ops.object.modifier_move_up(modifier=keep.name)
+                            select_only(bpy.context, mesh_obj)
+                            if bpy.context.object and bpy.context.object.mode != 'OBJECT':
+                                bpy.ops.object.mode_set(mode='OBJECT')
+                            bpy.ops.object.modifier_move_to_index(modifier=keep.name, index=0)
                         except Exception:
-                            break
-                        idx = get_index()
-                        if idx == last_index:
-                            # İlerleme yoksa kır
-                            break
-                        last_index = idx
-                        attempts += 1
-                except Exception:
-                    pass
+                            pass
                 # Vertex group kontrolü; yoksa bir kez daha Auto Weights dene
                 if len(mesh_obj.vertex_groups) == 0:
                     try:
-                        for obj in bpy.context.scene.objects:
-                            obj.select_set(False)
-                        armature_obj.select_set(True)
-                        mesh_obj.select_set(True)
-                        bpy.context.view_layer.objects.active = mesh_obj
+                        select_only(bpy.context, mesh_obj, armature_obj)
                         run_with_view3d_override(bpy.ops.object.parent_set, type='ARMATURE_AUTO')
                         mesh_obj.parent = None
                     except Exception:
@@ -1259,44 +1463,42 @@ class GameImporter(Operator):
             if len(mesh_obj.vertex_groups) == 0:
                 print("  ⚠️  Auto Weights failed → creating manual vertex groups")
                 # Tüm kemikler için vertex group oluştur
-                for bone in armature_obj.data.bones:
-                    if bone.name not in mesh_obj.vertex_groups:
-                        mesh_obj.vertex_groups.new(name=bone.name)
+                vg_map = ensure_vertex_groups(mesh_obj, bone_names)
                 
                 # Skin data varsa ağırlıkları uygula
-                if hasattr(mesh_obj, 'combined_skin_data') and mesh_obj['combined_skin_data']:
-                    skin_data = mesh_obj['combined_skin_data']
-                    for v_idx, skin in enumerate(skin_data):
-                        for i in range(4):
-                            bone_idx = skin['indices'][i]
-                            weight = skin['weights'][i]
-                            
-                            if bone_idx != 255 and bone_idx != 0xFF and weight > 0.001:
-                                if bone_idx < len(armature_obj.data.bones):
-                                    bone_name = armature_obj.data.bones[bone_idx].name
-                                    vg = mesh_obj.vertex_groups.get(bone_name)
-                                    if vg:
-                                        vg.add([v_idx], weight, 'ADD')
-                else:
-                    # Skin data yoksa en yakın kemiğe ağırlık ata
-                    print("  ⚠️  No skin data → assigning weights to nearest bones")
-                    # Her vertex için en yakın kemiği bul ve ağırlık ata
-                    for v_idx in range(len(mesh_obj.data.vertices)):
-                        vert_pos = mesh_obj.data.vertices[v_idx].co
-                        min_dist = float('inf')
-                        closest_bone = None
+                vertices = mesh_obj.data.vertices
+                unweighted = np.ones(len(vertices), dtype=bool)
+                if total_weights:
+                    # Yalnızca doğrudan eşleşen (aralık içi) index'ler kullanılır
+                    in_range = slot_bones < bone_total
+                    for bone_idx in np.unique(slot_bones[in_range]).tolist():
+                        vg = vg_map.get(bone_names[bone_idx])
+                        if vg:
+                            sel = slot_bones == bone_idx
+                            add_vertex_group_weights(vg, rows[sel], slot_weights[sel], quant_bits)
+                            unweighted[rows[sel][rows[sel] < len(vertices)]] = False
+                targets = np.nonzero(unweighted)[0]
+                if len(targets):
+                    # Aralık içi skin ağırlığı almayan vertex'ler en yakın kemiğe atanır
+                    print(f"  ⚠️  {len(targets)} vertices without usable skin data → assigning weights to nearest bones")
+                    # Her vertex için en yakın kemiği KD-tree ile bul (V·B yerine V·log B)
+                    bones = armature_obj.data.bones
+                    if len(bones):
+                        kd = kdtree.KDTree(len(bones))
+                        for i, bone in enumerate(bones):
+                            kd.insert(bone.head_local, i)
+                        kd.balance()
                         
-                        for bone in armature_obj.data.bones:
-                            bone_pos = bone.head_local
-                            dist = (vert_pos - bone_pos).length
-                            if dist < min_dist:
-                                min_dist = dist
-                                closest_bone = bone
+                        co = np.empty(len(vertices) * 3, dtype=np.float32)
+                        vertices.foreach_get("co", co)
+                        closest = np.fromiter((kd.find(p)[1] for p in co.reshape(-1, 3)[targets].tolist()),
+                                              dtype=np.int64, count=len(targets))
                         
-                        if closest_bone:
-                            vg = mesh_obj.vertex_groups.get(closest_bone.name)
+                        # Kemik başına tek vg.add çağrısı
+                        for bone_idx in np.unique(closest).tolist():
+                            vg = vg_map.get(bone_names[bone_idx])
                             if vg:
-                                vg.add([v_idx], 1.0, 'ADD')
+                                vg.add(targets[closest == bone_idx].tolist(), 1.0, 'ADD')
                 
                 print(f"  ✓ Manual vertex groups created: {len(mesh_obj.vertex_groups)} groups")
         except Exception as e:
@@ -1305,22 +1507,25 @@ class GameImporter(Operator):
         # Ensure armature is in pose mode for proper deformation
         bpy.context.view_layer.objects.active = armature_obj
         bpy.ops.object.mode_set(mode='POSE')
-        print(f"  DEBUG: Armature set to POSE mode for deformation")
+        if VERBOSE_DEBUG:
+            print(f"  DEBUG: Armature set to POSE mode for deformation")
         
         # Ensure mesh armature modifier is active
         for mod in mesh_obj.modifiers:
             if mod.type == 'ARMATURE' and mod.object == armature_obj:
                 mod.show_viewport = True
                 mod.show_render = True
-                print(f"  DEBUG: Armature modifier activated for {mesh_obj.name}")
+                if VERBOSE_DEBUG:
+                    print(f"  DEBUG: Armature modifier activated for {mesh_obj.name}")
                 break
 
     def import_bmt(self, filepath, ddj_files, auto_convert):
-        """Import BMT materials - FIXED with DDJ file list"""
+        """Import BMT materials - FIXED with DDJ file list (dönüş: BMT adı → Material)"""
         print(f"\n🎨 Importing BMT: {filepath}")
         
-        materials = []
-        converted_textures = {}
+        materials = {}
+        entries = []
+        memory_textures = {}
         
         # Create DDJ lookup map: filename -> full path
         ddj_map = {}
@@ -1329,190 +1534,192 @@ class GameImporter(Operator):
             ddj_map[filename.lower()] = ddj_path
         
         print(f"  Available DDJ files: {len(ddj_files)}")
-        if len(ddj_map) > 0:
+        if VERBOSE_DEBUG and len(ddj_map) > 0:
             print(f"  DEBUG: DDJ map keys: {list(ddj_map.keys())[:5]}")  # Show first 5
         
         with open(filepath, 'rb') as file:
-            # Signature check
-            sig = file.read(12).decode('utf-8', errors='replace')
-            if sig != "JMXVBMT 0102":
-                # Better error message
-                if sig.startswith("JMXVDDJ"):
-                    raise ValueError(f"❌ HATA: DDJ dosyasını BMT olarak seçtiniz! BMT File için .bmt dosyası seçin, DDJ'leri DDJ Files bölümüne ekleyin.")
-                else:
-                    raise ValueError(f"Invalid BMT signature: {sig}")
+            data = memoryview(file.read())
+        
+        # Signature check
+        sig = str(data[0:12], 'utf-8', 'replace')
+        if sig != "JMXVBMT 0102":
+            # Better error message
+            if sig.startswith("JMXVDDJ"):
+                raise ValueError(f"❌ HATA: DDJ dosyasını BMT olarak seçtiniz! BMT File için .bmt dosyası seçin, DDJ'leri DDJ Files bölümüne ekleyin.")
+            else:
+                raise ValueError(f"Invalid BMT signature: {sig}")
+        
+        # Material count
+        mat_count = _S_U32.unpack_from(data, 12)[0]
+        off = 16
+        print(f"  Materials: {mat_count}")
+        
+        # DDJ araması yalnızca dönüşüm yapılabilecekse (ayar açık ve PIL yüklü) yapılır
+        can_convert = auto_convert and PIL_AVAILABLE
+        for i in range(mat_count):
+            # Material name
+            name_len = _S_U32.unpack_from(data, off)[0]
+            off += 4
+            name = str(data[off:off + name_len], 'utf-8', 'replace')
+            off += name_len
             
-            # Material count
-            mat_count = struct.unpack('I', file.read(4))[0]
-            print(f"  Materials: {mat_count}")
+            # Colors
+            rgba = _S_COLORS.unpack_from(data, off)
+            colors = [rgba[c:c + 4] for c in range(0, 16, 4)]
+            off += 64
             
-            for i in range(mat_count):
-                # Material name
-                name_len = struct.unpack('I', file.read(4))[0]
-                name = file.read(name_len).decode('utf-8', errors='replace')
-                
-                # Colors
-                colors = [struct.unpack('4f', file.read(16)) for _ in range(4)]
-                
-                # Unknown float
-                unk_float = struct.unpack('f', file.read(4))[0]
-                
-                # Flag
-                flag = struct.unpack('I', file.read(4))[0]
-                
-                # Diffuse map path
-                diff_len = struct.unpack('I', file.read(4))[0]
-                diff_path = file.read(diff_len).decode('utf-8', errors='replace') if diff_len > 0 else ""
-                
-                # Debug: Show material texture reference
-                if diff_path:
-                    print(f"  Material '{name}' → Texture: {diff_path}")
-                
-                # Additional data - FIXED: read byte by byte
-                struct.unpack('f', file.read(4))  # float
-                struct.unpack('B', file.read(1))  # byte
-                struct.unpack('B', file.read(1))  # byte
-                struct.unpack('?', file.read(1))  # bool
-                
-                # Normal map (if flag set)
-                if flag & (1 << 13):
-                    norm_len = struct.unpack('I', file.read(4))[0]
-                    file.read(norm_len)  # skip normal map path
-                    struct.unpack('I', file.read(4))  # skip int
+            # Unknown float
+            unk_float = _S_F32.unpack_from(data, off)[0]
+            off += 4
+            
+            # Flag
+            flag = _S_U32.unpack_from(data, off)[0]
+            off += 4
+            
+            # Diffuse map path
+            diff_len = _S_U32.unpack_from(data, off)[0]
+            off += 4
+            diff_path = str(data[off:off + diff_len], 'utf-8', 'replace') if diff_len > 0 else ""
+            off += diff_len
+            
+            # Debug: Show material texture reference
+            if VERBOSE_DEBUG and diff_path:
+                print(f"  Material '{name}' → Texture: {diff_path}")
+            
+            # Additional data (float, byte, byte, bool) - kullanılmıyor, atlanır
+            off += 7
+            
+            # Normal map (if flag set)
+            norm_path = ""
+            if flag & (1 << 13):
+                norm_len = _S_U32.unpack_from(data, off)[0]
+                off += 4
+                norm_path = str(data[off:off + norm_len], 'utf-8', 'replace')
+                off += norm_len
+                off += 4  # skip int
+            
+            # AUTO-CONVERT DDJ from file list - dönüşüm döngüden sonra toplu yapılır
+            ddj_path = None
+            if can_convert and diff_path:
+                # Extract base name from material path
+                ddj_filename, ddj_lookup = ddj_name_for_texture(diff_path)
                 
-                # AUTO-CONVERT DDJ from file list
-                texture_path = None
-                if auto_convert and diff_path and PIL_AVAILABLE:
-                    # Extract base name from material path
-                    tex_name = os.path.basename(diff_path)
-                    tex_base = os.path.splitext(tex_name)[0]
-                    ddj_filename = tex_base + '.ddj'
-                    ddj_lookup = ddj_filename.lower()
-                    
+                if VERBOSE_DEBUG:
                     print(f"    Looking for: {ddj_filename}")
-                    
-                    # Debug: Show available DDJ files
-                    if ddj_lookup not in ddj_map and len(ddj_map) > 0:
-                        print(f"    DEBUG: Available in list: {list(ddj_map.keys())}")
-                    
-                    # Search in DDJ file list (case-insensitive)
-                    if ddj_lookup in ddj_map:
-                        ddj_path = ddj_map[ddj_lookup]
-                        print(f"    ✓ Found: {os.path.basename(ddj_path)}")
-                        
-                        if ddj_path not in converted_textures:
-                            png_path = self.convert_ddj(ddj_path)
-                            if png_path:
-                                converted_textures[ddj_path] = png_path
-                                texture_path = png_path
-                        else:
-                            texture_path = converted_textures[ddj_path]
-                    else:
-                        print(f"    ⚠️  Not found in DDJ list")
                 
-                # Create material
-                mat = self.create_material(name, colors, texture_path)
-                materials.append(mat)
-                
-                # DEBUG: Show which texture was applied
-                if texture_path:
-                    texture_name = os.path.basename(texture_path)
-                    print(f"  ✓ Material: {name} → Texture: {texture_name}")
+                # Search in DDJ file list (case-insensitive, anahtarlar eklenirken küçültüldü)
+                ddj_path = ddj_map.get(ddj_lookup)
+                if ddj_path:
+                    if VERBOSE_DEBUG:
+                        print(f"    ✓ Found: {os.path.basename(ddj_path)}")
                 else:
-                    print(f"  ✓ Material: {name} → No texture")
-        
+                    print(f"    ⚠️  Not found in DDJ list: {ddj_filename}")
+                    # Debug: Show available DDJ files
+                    if VERBOSE_DEBUG and len(ddj_map) > 0:
+                        print(f"    DEBUG: Available in list: {list(ddj_map.keys())}")
+            
+            # Aynı parametrelere sahip farklı isimli girdiler tek materyali paylaşır
+            content_key = (tuple(colors), round(unk_float, 3), flag, diff_path.lower(), norm_path.lower())
+            entries.append((name, colors, ddj_path, content_key))
+        
+        # Gerekli DDJ'leri tek seferde (mümkünse paralel) dönüştür
+        needed = list(dict.fromkeys(ddj_path for _, _, ddj_path, _ in entries if ddj_path))
+        converted_textures = {p: png for p, png in convert_ddj_files(needed).items() if png}
+        
+        for name, colors, ddj_path, content_key in entries:
+            cached = bpy.data.materials.get(_mat_cache.get(content_key, ""))
+            if cached is not None:
+                materials[name] = cached
+                if VERBOSE_DEBUG:
+                    print(f"  ✓ Material: {name} → reusing '{cached.name}' (same parameters)")
+                continue
+            
+            texture_path = converted_textures.get(ddj_path)
+            texture_image = None
+            if ddj_path and not texture_path:
+                # PNG yazılamadıysa (ör. salt okunur klasör) bellekte yükle
+                if ddj_path not in memory_textures:
+                    memory_textures[ddj_path] = load_ddj_image(ddj_path)
+                texture_image = memory_textures[ddj_path]
+            
+            # Create material
+            mat = self.create_material(name, colors, texture_path, image=texture_image, verified=True)
+            materials[name] = mat
+            _mat_cache[content_key] = mat.name
+            
+            # DEBUG: Show which texture was applied
+            if texture_path:
+                texture_name = os.path.basename(texture_path)
+                print(f"  ✓ Material: {name} → Texture: {texture_name}")
+            elif texture_image:
+                print(f"  ✓ Material: {name} → Texture: {texture_image.name} (in memory)")
+            else:
+                print(f"  ✓ Material: {name} → No texture")
+    
         print(f"  ✓ Converted {len(converted_textures)} textures")
         return materials
 
-    def convert_ddj(self, filepath):
-        """Convert DDJ to PNG - FIXED"""
-        if not PIL_AVAILABLE:
-            return None
-        
-        print(f"    🖼️  Converting: {os.path.basename(filepath)}")
-        
-        try:
-            with open(filepath, 'rb') as file:
-                sig = file.read(12).decode('utf-8', errors='replace')
-                if sig != "JMXVDDJ 1000":
-                    return None
-                
-                size = struct.unpack('I', file.read(4))[0]
-                type_val = struct.unpack('I', file.read(4))[0]
-                buffer = file.read(size)
-                
-                img = Image.open(io.BytesIO(buffer))
-                png_path = filepath.replace('.ddj', '.png')
-                img.save(png_path)
-                
-                print(f"    ✓ Saved: {os.path.basename(png_path)}")
-                return png_path
-                
-        except Exception as e:
-            print(f"    ✗ Failed: {e}")
-            return None
-
-    def create_material(self, name, colors, texture_path):
-        """Create Blender material - FIXED"""
+    def create_material(self, name, colors, texture_path, image=None, verified=False):
+        """Create Blender material - FIXED (image: önceden yüklenmiş Image, varsa path yerine kullanılır; verified: path az önce yazıldı, stat gerekmez)"""
         mat = bpy.data.materials.new(name=name)
         mat.use_nodes = True
         nodes = mat.node_tree.nodes
         links = mat.node_tree.links
         
-        # Clear default nodes
-        nodes.clear()
-        
-        # Create output node
-        output = nodes.new('ShaderNodeOutputMaterial')
-        output.location = (400, 0)
-        
-        # Create BSDF node
-        bsdf = nodes.new('ShaderNodeBsdfPrincipled')
-        bsdf.location = (0, 0)
-        
-        # Link BSDF to output
-        links.new(bsdf.outputs['BSDF'], output.inputs['Surface'])
+        # use_nodes'un kurduğu varsayılan Principled BSDF → Material Output zinciri yeniden kullanılır
+        output = nodes.get('Material Output')
+        bsdf = nodes.get('Principled BSDF')
+        if output is None or bsdf is None:
+            # Varsayılan düzen beklenenden farklıysa baştan kur
+            nodes.clear()
+            output = nodes.new('ShaderNodeOutputMaterial')
+            output.location = (400, 0)
+            bsdf = nodes.new('ShaderNodeBsdfPrincipled')
+            bsdf.location = (0, 0)
+            links.new(bsdf.outputs['BSDF'], output.inputs['Surface'])
         
         # Set base color
         if colors:
             bsdf.inputs['Base Color'].default_value = colors[0]
         
         # Add texture if available
-        if texture_path and os.path.exists(texture_path):
+        if image is not None or (texture_path and (verified or os.path.exists(texture_path))):
             tex = nodes.new('ShaderNodeTexImage')
             tex.location = (-400, 0)
             
             try:
-                tex.image = bpy.data.images.load(texture_path)
+                tex.image = image if image is not None else load_texture_image(texture_path)
                 links.new(tex.outputs['Color'], bsdf.inputs['Base Color'])
-                print(f"      ✓ Texture applied")
+                if VERBOSE_DEBUG:
+                    print(f"      ✓ Texture applied")
             except Exception as e:
                 print(f"      ✗ Texture load failed: {e}")
         
         return mat
 
-    def apply_materials_to_obj(self, obj, materials):
-        """Apply materials to object - FIXED: Match by material_name"""
+    def apply_materials_to_obj(self, obj, materials, mat_by_name):
+        """Apply materials to object - FIXED: Match by material_name (materials: BMT adı → Material, mat_by_name: Blender adı → Material)"""
         obj.data.materials.clear()
         
         # Get mesh's material name from custom property (set during creation)
         mesh_mat_name = obj.get('material_name', '')
+        first_mat = next(iter(materials.values()), None)
         
         if mesh_mat_name:
-            # Find matching material by name
-            matched_mat = None
-            for mat in materials:
-                # Exact match or starts with (for duplicates like .001)
-                if mat.name == mesh_mat_name or mat.name.startswith(mesh_mat_name + "."):
-                    matched_mat = mat
-                    break
+            # Find matching material by BMT entry name (paylaşılan materyaller dahil)
+            matched_mat = materials.get(mesh_mat_name)
+            if matched_mat is None:
+                # Exact match or base name (for duplicates like .001)
+                matched_mat = mat_by_name.get(mesh_mat_name)
             
             if matched_mat:
                 obj.data.materials.append(matched_mat)
                 obj.active_material = matched_mat
                 
-                # DEBUG: Show which texture is being applied
-                if matched_mat.node_tree and matched_mat.node_tree.nodes.get("Image Texture"):
+                # DEBUG: Show which texture is being applied (node araması yalnızca verbose modda)
+                if not VERBOSE_DEBUG:
+                    print(f"    ✓ '{obj.name}' → Material: '{matched_mat.name}'")
+                elif matched_mat.node_tree and matched_mat.node_tree.nodes.get("Image Texture"):
                     texture_node = matched_mat.node_tree.nodes["Image Texture"]
                     if texture_node.image:
                         texture_name = texture_node.image.name
@@ -1523,15 +1730,15 @@ class GameImporter(Operator):
                     print(f"    ✓ '{obj.name}' → Material: '{matched_mat.name}' → No texture node")
             else:
                 # Fallback: use first material
-                if materials:
-                    obj.data.materials.append(materials[0])
-                    obj.active_material = materials[0]
-                    print(f"    ⚠️  '{obj.name}' → Fallback to '{materials[0].name}' ('{mesh_mat_name}' not found)")
+                if first_mat:
+                    obj.data.materials.append(first_mat)
+                    obj.active_material = first_mat
+                    print(f"    ⚠️  '{obj.name}' → Fallback to '{first_mat.name}' ('{mesh_mat_name}' not found)")
         else:
             # No material name specified, use first material only
-            if materials:
-                obj.data.materials.append(materials[0])
-                obj.active_material = materials[0]
+            if first_mat:
+                obj.data.materials.append(first_mat)
+                obj.active_material = first_mat
 
 # ============================================================================
 # UI Sınıfları
@@ -1672,6 +1879,8 @@ class GameImporterPanel(Panel):
         col.operator("file_list.remove_file", icon='REMOVE', text="")
         col.operator("file_list.clear_files", icon='X', text="")
         box.prop(s, "combine_meshes")
+        box.prop(s, "use_parse_cache")
+        box.prop(s, "reuse_existing")
         
         # BSK File
         box = layout.box()
@@ -1680,6 +1889,8 @@ class GameImporterPanel(Panel):
         row = box.row(align=True)
         row.prop(s, "import_skeleton", toggle=True)
         row.prop(s, "bind_mesh", text="Bind", toggle=True)
+        box.prop(s, "weight_quant_bits")
+        box.prop(s, "parent_armatures_to_mesh")
         box.prop(s, "split_armatures", text="Split skeleton chains into separate armatures")
         if s.split_armatures:
             box.prop(s, "split_root_children", text="If single root: split by children")
@@ -1710,6 +1921,7 @@ class GameImporterPanel(Panel):
         row = layout.row()
         row.scale_y = 2.0
         row.operator("import_scene.game_files", icon='IMPORT')
+        layout.prop(s, "verbose_debug")
         
         # Status
         layout.separator()
@@ -1737,16 +1949,16 @@ classes = (
     GameImporterPanel,
 )
 
+register_classes, unregister_classes = bpy.utils.register_classes_factory(classes)
+
 def register():
-    for cls in classes:
-        bpy.utils.register_class(cls)
+    register_classes()
     bpy.types.Scene.game_importer_settings = PointerProperty(type=GameImporterSettings)
     print("✓ Game Importer V11 FIXED v4.5.1 DEBUG registered")
 
 def unregister():
     del bpy.types.Scene.game_importer_settings
-    for cls in reversed(classes):
-        bpy.utils.unregister_class(cls)
+    unregister_classes()
     print("✗ Game Importer V11 FIXED v4.5.1 DEBUG unregistered")
 
 if __name__ == "__main__":